@@ -0,0 +1,131 @@
+"""
+Бенчмарк перерисовки таймлайна (visualization/timeline_render).
+
+    python -m benchmarks.bench_render --tasks 200 --redraws 50
+
+Для каждого сценария печатает на одну перерисовку:
+  - сколько объектов стиля создано (QColor, QPen, QBrush, QFont, QFontMetricsF);
+  - пик памяти Python-объектов по tracemalloc;
+  - время.
+Qt запускается на платформе offscreen, окно не нужно.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5 import QtGui, QtWidgets
+
+from logic.task_manager import to_day
+from benchmarks.synth_db import make_task
+from visualization.timeline_render import TimelineRenderer
+
+STYLE_TYPES = ("QColor", "QPen", "QBrush", "QFont", "QFontMetricsF")
+VIEWPORT_W = 1200
+
+
+@contextmanager
+def count_style_objects():
+    """Подменяет конструкторы стилевых классов QtGui счётчиками."""
+    counts = Counter()
+    originals = {name: getattr(QtGui, name) for name in STYLE_TYPES}
+
+    def counting(name, cls):
+        def construct(*args, **kwargs):
+            counts[name] += 1
+            return cls(*args, **kwargs)
+        return construct
+
+    for name, cls in originals.items():
+        setattr(QtGui, name, counting(name, cls))
+    try:
+        yield counts
+    finally:
+        for name, cls in originals.items():
+            setattr(QtGui, name, cls)
+
+
+def make_tasks(n: int, seed: int):
+    rnd = random.Random(seed)
+    tasks = []
+    for i in range(n):
+        t = make_task(rnd, date.today(), 365)
+        t.update(id=i + 1, start_day=to_day(t["start_date"]), end_day=to_day(t["end_date"]))
+        tasks.append(t)
+    return tasks
+
+
+def bench_scenario(redraw, redraws):
+    """redraw(i) выполняет i-ю перерисовку; i = -1 — прогрев."""
+    redraw(-1)
+
+    with count_style_objects() as counts:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        for i in range(redraws):
+            redraw(i)
+        elapsed = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "style_objects": sum(counts.values()) / redraws,
+        "by_type": {name: counts[name] / redraws for name in STYLE_TYPES},
+        "peak_kb": peak / 1024,
+        "ms": elapsed / redraws * 1000,
+    }
+
+
+def scenarios(tasks):
+    """Имя -> функция перерисовки; у каждого сценария своя сцена."""
+    def zoom():
+        # те же задачи, меняется масштаб — стиль не меняется
+        renderer = TimelineRenderer(QtWidgets.QGraphicsScene())
+        return lambda i: renderer.render(tasks, (7, 14)[i % 2], VIEWPORT_W)
+
+    def theme():
+        # переключение темы туда и обратно
+        renderer = TimelineRenderer(QtWidgets.QGraphicsScene())
+        return lambda i: renderer.render(tasks, 14, VIEWPORT_W, dark_theme=i % 2 == 0)
+
+    def fresh():
+        # новый рендерер на каждую перерисовку (как при экспорте)
+        scene = QtWidgets.QGraphicsScene()
+
+        def redraw(i):
+            scene.clear()
+            TimelineRenderer(scene).render(tasks, 14, VIEWPORT_W)
+        return redraw
+
+    return {"zoom": zoom(), "theme": theme(), "fresh": fresh()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк перерисовки таймлайна")
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--redraws", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    tasks = make_tasks(args.tasks, args.seed)
+
+    for name, redraw in scenarios(tasks).items():
+        r = bench_scenario(redraw, args.redraws)
+        by_type = ", ".join(f"{k}={v:g}" for k, v in r["by_type"].items() if v)
+        print(f"{name:>6}: {r['style_objects']:8.1f} объектов стиля/перерисовку "
+              f"({by_type or '-'}), пик {r['peak_kb']:8.1f} КБ, {r['ms']:7.2f} мс")
+    del app
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Бенчмарк слоя хранения (logic/task_manager).
+
+    python -m benchmarks.bench_storage
+    python -m benchmarks.bench_storage --sizes 1000 10000 100000
+    python -m benchmarks.bench_storage --sizes 1000 10000 --update-baseline
+
+Результаты пишутся в JSON (--out). Если какая-либо операция медленнее
+сохранённого baseline больше чем на --tolerance, скрипт завершается с кодом 1.
+Размеры, которых нет в baseline, не сравниваются — об этом печатается предупреждение.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import task_manager
+from benchmarks.synth_db import cached_db, make_task
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "smart_planner_bench")
+# Размеры по умолчанию — те же, что в сохранённом baseline
+DEFAULT_SIZES = [1000, 10000]
+
+
+def _measure(func, repeat: int, ops: int = 1):
+    """Медиана времени одной операции (секунды) по repeat прогонам."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - t0) / ops)
+    return statistics.median(samples)
+
+
+def _measure_cycle(steps, repeat: int, ops: int):
+    """
+    Операции, которые идут только по порядку (создать -> изменить -> удалить):
+    за каждый прогон выполняется весь цикл, но время каждой операции своё.
+    steps — [(имя, функция)]. Возвращает имя -> медиана времени одной операции.
+    """
+    samples = {name: [] for name, _ in steps}
+    for _ in range(repeat):
+        for name, func in steps:
+            t0 = time.perf_counter()
+            func()
+            samples[name].append((time.perf_counter() - t0) / ops)
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+
+def bench_size(size: int, repeat: int, seed: int):
+    src = cached_db(CACHE_DIR, size, seed)
+    work_dir = tempfile.mkdtemp(prefix="bench_")
+    db_file = os.path.join(work_dir, "bench.db")
+    shutil.copy(src, db_file)
+    try:
+        conn = task_manager.connect(db_file)
+        task_manager.ensure_schema(conn)
+        rnd = random.Random(seed)
+        ids = [row[0] for row in conn.execute("SELECT id FROM tasks")]
+        today = task_manager.to_day(date.today().isoformat())
+        single_ops = min(200, size)
+        payloads = [make_task(rnd, date.today(), 365) for _ in range(single_ops)]
+
+        results = {}
+        results["fetch_all_min"] = _measure(lambda: task_manager.fetch_all_min(conn), repeat)
+        results["fetch_all_full"] = _measure(lambda: task_manager.fetch_all_full(conn), repeat)
+        results["fetch_page_min"] = _measure(
+            lambda: task_manager.fetch_page_min(conn, ids[len(ids) // 2], 200), repeat)
+        results["fetch_timeline_tasks"] = _measure(
+            lambda: task_manager.fetch_timeline_tasks(conn, 5, today), repeat)
+
+        sample_ids = [rnd.choice(ids) for _ in range(1000)]
+        results["fetch_one"] = _measure(
+            lambda: [task_manager.fetch_one(conn, tid) for tid in sample_ids], repeat, len(sample_ids))
+
+        created = []
+
+        def create():
+            created.clear()
+            created.extend(task_manager.create_task(conn, p) for p in payloads)
+
+        def update():
+            for tid, p in zip(created, reversed(payloads)):
+                task_manager.update_task(conn, tid, p)
+
+        def delete():
+            for tid in created:
+                task_manager.delete_task(conn, tid)
+
+        results.update(_measure_cycle(
+            [("create_task", create), ("update_task", update), ("delete_task", delete)],
+            repeat, single_ops))
+
+        def create_bulk():
+            created.clear()
+            created.extend(task_manager.create_tasks(conn, payloads))
+
+        def update_bulk():
+            task_manager.update_tasks(
+                conn, [dict(p, id=tid) for tid, p in zip(created, reversed(payloads))])
+
+        def delete_bulk():
+            task_manager.delete_tasks(conn, created)
+
+        results.update(_measure_cycle(
+            [("create_tasks_bulk", create_bulk), ("update_tasks_bulk", update_bulk),
+             ("delete_tasks_bulk", delete_bulk)],
+            repeat, single_ops))
+        conn.close()
+        return results
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def compare(current, baseline, tolerance, min_delta=0.0):
+    """
+    Список регрессий: (размер, операция, baseline, текущее значение).
+    Разница меньше min_delta секунд не считается регрессией (шум быстрых операций).
+    """
+    regressions = []
+    for size, ops in current.items():
+        for op, value in ops.items():
+            base = baseline.get(size, {}).get(op)
+            if base is not None and value > base * (1 + tolerance) and value - base > min_delta:
+                regressions.append((size, op, base, value))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк task_manager")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="допустимое замедление относительно baseline (0.5 = +50%%)")
+    parser.add_argument("--min-delta", type=float, default=0.0001,
+                        help="минимальное абсолютное замедление в секундах, считающееся регрессией")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        print(f"=== {size} задач ===")
+        results[str(size)] = bench_size(size, args.repeat, args.seed)
+        for op, value in results[str(size)].items():
+            print(f"{op:>22}: {value * 1000:10.3f} мс")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "unit": "seconds per operation",
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+        print(f"Baseline обновлён: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Baseline не найден, сравнение пропущено")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    for size, ops in results.items():
+        missing = [op for op in ops if op not in baseline.get(size, {})]
+        if size not in baseline:
+            print(f"ВНИМАНИЕ: размера {size} нет в baseline, он не сравнивается")
+        elif missing:
+            print(f"ВНИМАНИЕ: {size} / {', '.join(missing)} нет в baseline, не сравниваются")
+    regressions = compare(results, baseline, args.tolerance, args.min_delta)
+    for size, op, base, value in regressions:
+        print(f"РЕГРЕССИЯ {size} / {op}: {base * 1000:.3f} мс -> {value * 1000:.3f} мс")
+    if regressions:
+        return 1
+    print("Регрессий нет")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
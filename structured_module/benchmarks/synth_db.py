@@ -0,0 +1,90 @@
+"""
+Генератор синтетических баз задач для бенчмарков.
+
+    python -m benchmarks.synth_db out.db --tasks 100000
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import task_manager
+
+WORDS = (
+    "подготовка экзамен проект отчёт сайт лендинг презентация курс английский "
+    "физика математика ремонт бег марафон книга статья диплом релиз бюджет "
+    "встреча клиент аналитика дизайн тестирование документация обучение спорт"
+).split()
+
+
+def _text(rnd, min_words, max_words):
+    return " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(min_words, max_words)))
+
+
+def make_task(rnd, first_day: date, span_days: int):
+    """
+    Одна задача с правдоподобными размерами:
+    название 2–8 слов, пункты SMART по 0–60 слов (часть пустые),
+    длительность в основном короткая, с редкими долгими задачами.
+    """
+    start = first_day + timedelta(days=rnd.randrange(span_days))
+    duration = min(int(rnd.expovariate(1 / 14)), 365)
+    end = start + timedelta(days=duration)
+    smart = [_text(rnd, 0, 60) if rnd.random() < 0.8 else "" for _ in range(4)]
+    return {
+        "title": _text(rnd, 2, 8).capitalize(),
+        "s_text": smart[0],
+        "m_text": smart[1],
+        "a_text": smart[2],
+        "r_text": smart[3],
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+    }
+
+
+def generate(db_file: str, tasks: int, years: int = 5, seed: int = 1, chunk_size: int = 20000):
+    """Создаёт базу db_file с tasks задачами, распределёнными на years лет вокруг сегодняшнего дня."""
+    rnd = random.Random(seed)
+    span_days = 365 * years
+    first_day = date.today() - timedelta(days=span_days * 3 // 4)
+
+    conn = task_manager.connect(db_file)
+    task_manager.ensure_schema(conn)
+    done = 0
+    while done < tasks:
+        n = min(chunk_size, tasks - done)
+        task_manager.create_tasks(conn, [make_task(rnd, first_day, span_days) for _ in range(n)],
+                                  chunk_size=None)
+        done += n
+    conn.close()
+
+
+def cached_db(cache_dir: str, tasks: int, seed: int = 1) -> str:
+    """Путь к сгенерированной базе; база создаётся один раз и переиспользуется."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"synth_{tasks}_{seed}.db")
+    if not os.path.exists(path):
+        tmp = path + ".tmp"
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(tmp + suffix):
+                os.remove(tmp + suffix)
+        generate(tmp, tasks, seed=seed)
+        os.replace(tmp, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация синтетической базы задач")
+    parser.add_argument("db_file")
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    generate(args.db_file, args.tasks, years=args.years, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
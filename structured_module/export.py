@@ -0,0 +1,147 @@
+"""
+Экспорт таймлайна в PNG / SVG / PDF без окна (платформа Qt offscreen).
+
+    python export.py ~/smart_planner.db --format png --step 14 --width 1600
+    python export.py reports/*.db --format pdf --out-dir out --jobs 4
+
+Каждая база рисуется в отдельном процессе пула. QApplication создаётся
+только внутри рабочих процессов, родитель Qt не запускает.
+Базы открываются только для чтения и не меняются (ни журнал, ни схема).
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtCore, QtGui, QtSvg, QtWidgets
+
+from logic import migrations, task_manager
+from visualization.timeline_render import DEFAULT_MAX_TASKS, ZOOM_STEPS, draw_timeline, today_day
+from visualization.timeline_style import style_for
+
+FORMATS = ("png", "svg", "pdf")
+
+_app = None
+
+
+def _ensure_app():
+    """QApplication текущего процесса (нужен QGraphicsScene и шрифтам)."""
+    global _app
+    _app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([sys.argv[0]])
+    return _app
+
+
+def _paint(scene, painter, rect, background):
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    painter.fillRect(QtCore.QRectF(0, 0, rect.width(), rect.height()), background)
+    scene.render(painter, QtCore.QRectF(0, 0, rect.width(), rect.height()), rect)
+    painter.end()
+
+
+def save_scene(scene, out_file, fmt, background):
+    """Сохраняет всю сцену (sceneRect) в файл выбранного формата."""
+    rect = scene.sceneRect()
+    size = QtCore.QSize(int(rect.width() + 0.5), int(rect.height() + 0.5))
+
+    if fmt == "png":
+        image = QtGui.QImage(size, QtGui.QImage.Format_ARGB32_Premultiplied)
+        _paint(scene, QtGui.QPainter(image), rect, background)
+        if not image.save(out_file, "PNG"):
+            raise OSError(f"Не удалось записать {out_file}")
+    elif fmt == "svg":
+        generator = QtSvg.QSvgGenerator()
+        generator.setFileName(out_file)
+        generator.setSize(size)
+        generator.setViewBox(QtCore.QRect(QtCore.QPoint(0, 0), size))
+        generator.setTitle("SMART-Planner")
+        _paint(scene, QtGui.QPainter(generator), rect, background)
+    elif fmt == "pdf":
+        writer = QtGui.QPdfWriter(out_file)
+        # 72 dpi: одна точка страницы — один пиксель сцены
+        writer.setResolution(72)
+        writer.setPageSize(QtGui.QPageSize(QtCore.QSizeF(size), QtGui.QPageSize.Point))
+        writer.setPageMargins(QtCore.QMarginsF(0, 0, 0, 0))
+        writer.setTitle("SMART-Planner")
+        _paint(scene, QtGui.QPainter(writer), rect, background)
+    else:
+        raise ValueError(f"Неизвестный формат: {fmt}")
+
+
+def export_db(db_file, out_file, fmt="png", step_days=14, width=1600,
+              max_tasks=DEFAULT_MAX_TASKS, ui_scale=1.0, dark_theme=True):
+    """Рисует таймлайн базы db_file в out_file. Возвращает число задач на диаграмме."""
+    if not os.path.isfile(db_file):
+        raise FileNotFoundError(f"База не найдена: {db_file}")
+    _ensure_app()
+    # Входные базы только читаем: без WAL и миграций, файл остаётся как был
+    conn = task_manager.connect_readonly(db_file)
+    try:
+        tasks = task_manager.fetch_timeline_tasks(
+            conn, max_tasks, today_day(), computed_days=not migrations.has_day_columns(conn))
+    finally:
+        conn.close()
+
+    scene = QtWidgets.QGraphicsScene()
+    draw_timeline(scene, tasks, step_days, width, ui_scale=ui_scale, dark_theme=dark_theme)
+    save_scene(scene, out_file, fmt, style_for(dark_theme, ui_scale).colors["background"])
+    return len(tasks)
+
+
+def _out_path(db_file, out_dir, fmt):
+    name = os.path.splitext(os.path.basename(db_file))[0]
+    return os.path.join(out_dir or os.path.dirname(os.path.abspath(db_file)), f"{name}.{fmt}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Экспорт таймлайна SMART-Planner без окна")
+    parser.add_argument("db_files", nargs="+", help="базы задач (.db)")
+    parser.add_argument("--format", choices=FORMATS, default="png")
+    parser.add_argument("--step", type=int, choices=ZOOM_STEPS, default=14,
+                        help="дней на деление оси")
+    parser.add_argument("--width", type=int, default=1600,
+                        help="минимальная ширина изображения в пикселях")
+    parser.add_argument("--tasks", type=int, default=DEFAULT_MAX_TASKS,
+                        help="сколько задач показывать")
+    parser.add_argument("--scale", type=float, default=1.0, help="масштаб интерфейса")
+    parser.add_argument("--theme", choices=("dark", "light"), default="dark")
+    parser.add_argument("--out-dir", help="каталог результатов (по умолчанию рядом с базой)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="число процессов")
+    args = parser.parse_args()
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+    options = dict(fmt=args.format, step_days=args.step, width=args.width,
+                   max_tasks=args.tasks, ui_scale=args.scale, dark_theme=args.theme == "dark")
+    jobs = {db: _out_path(db, args.out_dir, args.format) for db in args.db_files}
+
+    failed = 0
+    if args.jobs <= 1 or len(jobs) == 1:
+        for db, out in jobs.items():
+            try:
+                count = export_db(db, out, **options)
+                print(f"{db} -> {out} ({count} задач)")
+            except Exception as e:
+                failed += 1
+                print(f"ОШИБКА {db}: {e}", file=sys.stderr)
+        return 1 if failed else 0
+
+    # spawn: дочерние процессы не наследуют состояние Qt родителя
+    with ProcessPoolExecutor(max_workers=min(args.jobs, len(jobs)),
+                             mp_context=get_context("spawn")) as pool:
+        futures = {pool.submit(export_db, db, out, **options): (db, out) for db, out in jobs.items()}
+        for future in as_completed(futures):
+            db, out = futures[future]
+            try:
+                print(f"{db} -> {out} ({future.result()} задач)")
+            except Exception as e:
+                failed += 1
+                print(f"ОШИБКА {db}: {e}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 import json
+import math
 import os
 
 from PyQt5.QtGui import QIcon
@@ -7,14 +8,23 @@ from PyQt5.QtGui import QIcon
 # GUI widgets
 from gui.task_list_widget import TaskListWidget
 from gui.task_editor import TaskEditorWidget
+from gui.redraw_scheduler import RedrawScheduler
+from gui.selection_sync import SelectionSync
 
 # Logic
 from logic import task_manager
+from logic.task_cache import TaskCache
+from logic.db_worker import DbWorker
 from logic.validator import validate_task
 
 # Visualization
-from visualization.timeline_render import draw_timeline
-from visualization.animator_controller import apply_zoom_index
+from visualization.timeline_render import (TimelineRenderer, today_day, DEFAULT_MAX_TASKS,
+                                           pixels_per_day, tick_step)
+from visualization.timeline_view import TimelineView
+from visualization.render_profiler import RenderProfiler
+from visualization.render_options import (RENDER_BACKENDS, UPDATE_MODES, render_options,
+                                          apply_view_options, item_cache_mode)
+from visualization.animator_controller import ZoomAnimator, WHEEL_FACTOR
 
 from PyQt5 import QtWidgets, QtCore
 
@@ -36,6 +46,16 @@ def resource_path(relative_path):
 
 DB_PATH = os.path.join(os.path.expanduser("~"), "smart_planner.db")
 CONFIG_PATH = os.path.join(os.path.expanduser("~"), "smart_planner_config.json")
+# Журнал замеров перерисовки (JSONL), пишется, пока профилирование включено (F12)
+RENDER_LOG_PATH = os.path.join(os.path.expanduser("~"), "smart_planner_render.jsonl")
+
+
+def read_config():
+    """Содержимое конфига или настройки по умолчанию, если файла ещё нет."""
+    if os.path.exists(CONFIG_PATH):
+        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"ui_scale": 1.0, "theme": "dark"}
 
 from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtWidgets import QLabel, QGraphicsOpacityEffect, QWidget
@@ -129,8 +149,11 @@ class ToastNotification(QWidget):
 class SettingsDialog(QtWidgets.QDialog):
     scaleChanged = QtCore.pyqtSignal(float)
     themeChanged = QtCore.pyqtSignal(str)
+    timelineTasksChanged = QtCore.pyqtSignal(int)
+    renderOptionsChanged = QtCore.pyqtSignal(dict)
 
-    def __init__(self, current_scale=1.0, current_theme="dark"):
+    def __init__(self, current_scale=1.0, current_theme="dark", timeline_tasks=DEFAULT_MAX_TASKS,
+                 render_opts=None):
         super().__init__()
         self.setWindowTitle("Настройки")
         self.resize(320, 200)
@@ -175,6 +198,50 @@ class SettingsDialog(QtWidgets.QDialog):
         self.radio_dark.toggled.connect(lambda checked: self.on_theme_change("dark") if checked else None)
         self.radio_light.toggled.connect(lambda checked: self.on_theme_change("light") if checked else None)
 
+        # Количество задач на диаграмме
+        tasks_layout = QtWidgets.QHBoxLayout()
+        tasks_layout.addWidget(QtWidgets.QLabel("Задач на диаграмме:"))
+        self.tasks_spin = QtWidgets.QSpinBox()
+        self.tasks_spin.setRange(1, 1000)
+        self.tasks_spin.setValue(timeline_tasks)
+        self.tasks_spin.valueChanged.connect(self.timelineTasksChanged.emit)
+        tasks_layout.addWidget(self.tasks_spin)
+        layout.addLayout(tasks_layout)
+
+        # Отрисовка диаграммы
+        self.render_opts = dict(render_options(render_opts or {}))
+        render_box = QtWidgets.QGroupBox("Отрисовка диаграммы")
+        render_form = QtWidgets.QFormLayout(render_box)
+
+        self.backend_combo = QtWidgets.QComboBox()
+        for key, title in RENDER_BACKENDS.items():
+            self.backend_combo.addItem(title, key)
+        self.backend_combo.setCurrentIndex(self.backend_combo.findData(self.render_opts["render_backend"]))
+        self.backend_combo.setToolTip("Программный OpenGL вступает в силу после перезапуска")
+        render_form.addRow("Способ:", self.backend_combo)
+
+        self.update_combo = QtWidgets.QComboBox()
+        for key, (_, title) in UPDATE_MODES.items():
+            self.update_combo.addItem(title, key)
+        self.update_combo.setCurrentIndex(self.update_combo.findData(self.render_opts["viewport_update"]))
+        render_form.addRow("Обновление:", self.update_combo)
+
+        self.cache_bg_check = QtWidgets.QCheckBox("Кэшировать фон")
+        self.cache_bg_check.setChecked(self.render_opts["cache_background"])
+        self.item_cache_check = QtWidgets.QCheckBox("Кэшировать бары (DeviceCoordinateCache)")
+        self.item_cache_check.setChecked(self.render_opts["item_cache"])
+        self.aa_check = QtWidgets.QCheckBox("Сглаживание")
+        self.aa_check.setChecked(self.render_opts["antialiasing"])
+        for check in (self.cache_bg_check, self.item_cache_check, self.aa_check):
+            render_form.addRow(check)
+        layout.addWidget(render_box)
+
+        self.backend_combo.currentIndexChanged.connect(self.on_render_change)
+        self.update_combo.currentIndexChanged.connect(self.on_render_change)
+        self.cache_bg_check.toggled.connect(self.on_render_change)
+        self.item_cache_check.toggled.connect(self.on_render_change)
+        self.aa_check.toggled.connect(self.on_render_change)
+
         # Кнопки
         btn_box = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Close)
         close_btn = btn_box.button(QtWidgets.QDialogButtonBox.Close)
@@ -182,6 +249,16 @@ class SettingsDialog(QtWidgets.QDialog):
         btn_box.rejected.connect(self.reject)
         layout.addWidget(btn_box)
 
+    def on_render_change(self, *args):
+        self.render_opts = {
+            "render_backend": self.backend_combo.currentData(),
+            "viewport_update": self.update_combo.currentData(),
+            "cache_background": self.cache_bg_check.isChecked(),
+            "item_cache": self.item_cache_check.isChecked(),
+            "antialiasing": self.aa_check.isChecked(),
+        }
+        self.renderOptionsChanged.emit(self.render_opts)
+
     def on_scale_change(self, value):
         scale = value / 10
         self.scale_value_label.setText(f"{scale:.1f}x")
@@ -200,12 +277,19 @@ class SmartPlannerMainWindow(QtWidgets.QMainWindow):
         self.resize(1100, 720)
 
         # Таймлайн
-        self.zoom_modes = [1, 7, 14, 30]
-        self.zoom_index = 2
+        self._zoom_anchor = None  # (день, x во viewport) для перерисовки после zoom
+        self._pending_writes = {}  # id задачи -> число её записей, ещё не выполненных воркером
 
-        # Подключение к БД
-        self.conn = task_manager.connect(DB_PATH)
+        # Подключение к БД (одно соединение на поток, WAL)
+        self.db = task_manager.ConnectionManager(DB_PATH)
+        self.conn = self.db.get()
         task_manager.ensure_schema(self.conn)
+        # Кэш задач: повторные чтения отдаются из памяти
+        self.tasks = TaskCache(self.db)
+        # Все запросы к БД из окна выполняются в фоновом потоке
+        self.worker = DbWorker(self.db, self)
+        self.worker.start()
+        self._diagram_generation = 0
 
         # Основной layout
         main = QtWidgets.QWidget()
@@ -222,6 +306,18 @@ class SmartPlannerMainWindow(QtWidgets.QMainWindow):
         vbox_left.addWidget(title_label)
         title_label.setObjectName("titleLabel")
 
+        # Поиск по задачам (срабатывает после паузы в наборе)
+        self.search_input = QtWidgets.QLineEdit()
+        self.search_input.setPlaceholderText("Поиск...")
+        self.search_input.setClearButtonEnabled(True)
+        vbox_left.addWidget(self.search_input)
+
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self._reload_list)
+        self.search_input.textChanged.connect(self.search_timer.start)
+
         # Сам виджет списка задач
         self.task_list = TaskListWidget()
         vbox_left.addWidget(self.task_list)
@@ -278,19 +374,38 @@ class SmartPlannerMainWindow(QtWidgets.QMainWindow):
 
         # Сцена и view
         self.scene = QtWidgets.QGraphicsScene()
-        self.view = QtWidgets.QGraphicsView(self.scene)
-        self.view.setRenderHint(QtGui.QPainter.Antialiasing)
+        self.view = TimelineView(self.scene, WHEEL_FACTOR)
         self.view.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
         self.view.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
         tl_layout.addWidget(self.view)
+        # Элементы диаграммы живут между перерисовками;
+        # создаются только для видимой части и достраиваются при прокрутке
+        self.timeline = TimelineRenderer(self.scene)
+        # Профилирование фаз перерисовки: F12 включает замеры, оверлей и журнал
+        self.profiler = RenderProfiler(RENDER_LOG_PATH)
+        self.timeline.profiler = self.profiler
+        self.view.profiler = self.profiler
+        QtWidgets.QShortcut(QtGui.QKeySequence("F12"), self, activated=self.toggle_profiling)
+        # Масштаб: сразу преобразование view, перерисовка — когда анимация закончится
+        self.zoom = ZoomAnimator(self.view, 14, self.timeline.day_at, self)
+        self.zoom.settled.connect(self._on_zoom_settled)
+        self.view.zoomRequested.connect(self.zoom.wheel)
+        self.view.horizontalScrollBar().valueChanged.connect(self._update_visible_range)
+        self.view.horizontalScrollBar().rangeChanged.connect(self._update_visible_range)
         self.right_stack.addWidget(timeline_widget)
+        # Перерисовка диаграммы — не чаще раза за проход цикла событий и только на её странице
+        self.redraw = RedrawScheduler(self.draw_diagram,
+                                      lambda: self.right_stack.currentIndex() == 1, self)
+        # При изменении размера ось подгоняется под ширину окна
+        self.view.resized.connect(self.redraw.request)
 
         # Сигналы
-        self.task_list.itemSelected.connect(self._on_task_selected)
+        # Выделение задачи в списке и на диаграмме согласуется в обе стороны
+        self.selection = SelectionSync(self.task_list, self.timeline, self.scene, self)
+        self.selection.taskSelected.connect(self._on_task_selected)
         self.editor.sigSave.connect(self._on_save_task)
         self.editor.sigDelete.connect(self._on_delete_task)
         self.editor.sigNew.connect(self._on_new_task)
-        self.scene.selectionChanged.connect(self._on_scene_selection_changed)
         self.editor.btnSwitch.clicked.connect(self.toggle_view)
 
         # Загружаем config
@@ -298,13 +413,15 @@ class SmartPlannerMainWindow(QtWidgets.QMainWindow):
         # Применяем тему и масштаб
         self._apply_styles()
         QtCore.QTimer.singleShot(0, self._apply_initial_scale)
-        # Загружаем задачи
-        self._reload_list()
+        # Загружаем задачи (первая страница, остальное — по прокрутке)
+        self.task_list.set_source(self._fetch_list_page, self._fetch_list_head)
         self.right_stack.setCurrentIndex(0)
 
         # 1. Добавляем StatusBar (Гипотеза №1)
         # Создаем один экземпляр тоста для всего окна
         self.toast = ToastNotification(self)
+        # Способ отрисовки диаграммы из конфига (после тоста: о сбое OpenGL сообщаем им)
+        self.apply_render_options(self.render_opts)
 
         # Статусбар можно оставить пустым или вообще убрать
         self.setStatusBar(QtWidgets.QStatusBar())
@@ -322,16 +439,15 @@ class SmartPlannerMainWindow(QtWidgets.QMainWindow):
             QtCore.QTimer.singleShot(500, self.run_onboarding)
 
     def load_config(self):
-        if os.path.exists(CONFIG_PATH):
-            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
-        else:
-            cfg = {"ui_scale": 1.0, "theme": "dark"}
+        cfg = read_config()
         self.current_scale = cfg.get("ui_scale", 1.0)
         self.current_theme = cfg.get("theme", "dark")
+        self.timeline_tasks = cfg.get("timeline_tasks", DEFAULT_MAX_TASKS)
+        self.render_opts = render_options(cfg)
 
     def save_config(self):
-        cfg = {"ui_scale": self.current_scale, "theme": self.current_theme}
+        cfg = {"ui_scale": self.current_scale, "theme": self.current_theme,
+               "timeline_tasks": self.timeline_tasks, **self.render_opts}
         with open(CONFIG_PATH, "w", encoding="utf-8") as f:
             json.dump(cfg, f, ensure_ascii=False, indent=4)
 
@@ -410,19 +526,19 @@ class SmartPlannerMainWindow(QtWidgets.QMainWindow):
             color:{fg};
             font-size:{font_size}pt;
         }}
-        QListWidget {{
+        QListView {{
             background:{widget_bg};
             border:1px solid {border_color};
             border-radius:10px;
             padding:8px;
         }}
-        QListWidget::item {{
+        QListView::item {{
             background:{item_bg};
             padding:6px;
             margin:3px;
             border-radius:6px;
         }}
-        QListWidget::item:selected {{
+        QListView::item:selected {{
             background:{item_selected_bg};
             color:{item_selected_fg};
             font-weight:bold;
@@ -532,25 +648,54 @@ class SmartPlannerMainWindow(QtWidgets.QMainWindow):
     def apply_theme(self, theme: str):
         self.current_theme = theme
         self._apply_styles()
-        self.draw_diagram()
+        self.redraw.request()
+
+    def apply_timeline_tasks(self, count: int):
+        self.timeline_tasks = count
+        self.redraw.request()
+
+    def apply_render_options(self, options):
+        self.render_opts = dict(options)
+        if not apply_view_options(self.view, self.render_opts):
+            self.show_status_msg("OpenGL недоступен, используется растровая отрисовка", "#f38ba8")
+        self.timeline.set_cache_mode(item_cache_mode(self.render_opts))
 
     def _apply_initial_scale(self):
         self.apply_ui_scale(self.current_scale)
-        self.draw_diagram()
 
     def apply_ui_scale(self, scale: float):
         self.current_scale = scale
         self._apply_styles()
-        self.draw_diagram()
+        self.redraw.request()
 
     def _reload_list(self):
-        rows = task_manager.fetch_all_min(self.conn)
-        self.task_list.load(rows)
+        query = self.search_input.text().strip()
+        if query:
+            self.worker.query(task_manager.search_tasks, query,
+                              on_done=lambda rows: self._show_search_results(query, rows))
+        else:
+            self.task_list.reload()
+
+    def _show_search_results(self, query, rows):
+        # Пока шёл запрос, текст поиска мог измениться
+        if self.search_input.text().strip() == query:
+            self.task_list.show_rows(rows)
+
+    def _fetch_list_page(self, after_id, limit, done):
+        self.worker.query(task_manager.fetch_page_min, after_id, limit, on_done=done)
+
+    def _fetch_list_head(self, before_id, limit, done):
+        self.worker.query(task_manager.fetch_page_before, before_id, limit, on_done=done)
 
     def _load_task_into_editor(self, task_id):
-        task = task_manager.fetch_one(self.conn, task_id)
+        # Пока запись задачи в очереди, в кэше её старая версия: читаем через воркер,
+        # запрос выполнится после записи
+        task = None if task_id in self._pending_writes else self.tasks.peek(task_id)
         if task:
             self.editor.set_task(task)
+        else:
+            self.worker.submit(self.tasks.get, task_id,
+                               on_done=lambda row: self.editor.set_task(row) if row else None)
 
     def _on_task_selected(self, task_id):
         self._load_task_into_editor(task_id)
@@ -558,6 +703,21 @@ class SmartPlannerMainWindow(QtWidgets.QMainWindow):
 
 
 
+    def closeEvent(self, event):
+        # Сцена удаляется раньше view: её сигналы и сигналы полос прокрутки
+        # (они срабатывают при разрушении view) больше не должны доходить до диаграммы
+        self.selection.detach()
+        scrollbar = self.view.horizontalScrollBar()
+        for signal in (scrollbar.valueChanged, scrollbar.rangeChanged):
+            try:
+                signal.disconnect(self._update_visible_range)
+            except TypeError:
+                # окно уже закрывали
+                pass
+        self.worker.stop()
+        self.db.close_all()
+        super().closeEvent(event)
+
     def moveEvent(self, event):
         super().moveEvent(event)
         if self.toast.isVisible():
@@ -587,16 +747,23 @@ class SmartPlannerMainWindow(QtWidgets.QMainWindow):
             self.show_status_msg(f"⚠ {err}", color="#f38ba8", msec=display_time)
             return
 
+        # Запись идёт в фоне; интерфейс обновляем сразу (оптимистично),
+        # а при ошибке показываем её и перечитываем список
         if payload.get("id"):
-            task_manager.update_task(self.conn, payload["id"], payload)
+            task_id = payload["id"]
+            self.task_list.set_title(task_id, payload["title"])
+            self._submit_write(task_id, self.tasks.update, task_id, payload,
+                               on_done=lambda _: self._on_tasks_changed(
+                                   upserted={"id": task_id, "title": payload["title"]}))
             # Зеленый (Green) цвет плашки успеха: #a6e3a1
             self.show_status_msg(f"✅ Задача обновлена", color="#a6e3a1", msec=display_time)
         else:
-            new_id = task_manager.create_task(self.conn, payload)
-            payload["id"] = new_id
+            self.worker.submit(self.tasks.create, payload,
+                               on_done=lambda task_id: self._on_tasks_changed(
+                                   upserted={"id": task_id, "title": payload["title"]}),
+                               on_error=self._on_db_error)
             self.show_status_msg("✨ Задача создана", color="#a6e3a1", msec=display_time)
 
-        self._reload_list()
         self.editor.clear_form()
         self.task_list.clearSelection()
         self.right_stack.setCurrentIndex(0)
@@ -612,70 +779,142 @@ class SmartPlannerMainWindow(QtWidgets.QMainWindow):
         msg.exec_()
 
         if msg.clickedButton() == btn_yes:
-            task_manager.delete_task(self.conn, task_id)
+            # Строка убирается сразу; при ошибке _on_db_error перечитает список
+            self.task_list.remove(task_id)
+            self._submit_write(task_id, self.tasks.delete, task_id,
+                               on_done=lambda _: self._on_tasks_changed(removed=task_id))
             self.editor.clear_form()
             self.task_list.clearSelection()
-            self._reload_list()
             self.show_status_msg("🗑 Задача удалена", color="#fab387")  # Оранжевый
 
+    def _submit_write(self, task_id, func, *args, on_done):
+        """Запись задачи в фоне; до её завершения задача не читается из кэша."""
+        self._pending_writes[task_id] = self._pending_writes.get(task_id, 0) + 1
+
+        def finish():
+            left = self._pending_writes.pop(task_id) - 1
+            if left:
+                self._pending_writes[task_id] = left
+
+        def done(result):
+            finish()
+            on_done(result)
+
+        def failed(message):
+            finish()
+            self._on_db_error(message)
+
+        self.worker.submit(func, *args, on_done=done, on_error=failed)
+
+    def _on_tasks_changed(self, upserted=None, removed=None):
+        """Запись в БД подтверждена — обновляем строку списка и диаграмму."""
+        if self.search_input.text().strip():
+            # попадание в результаты поиска зависит от текста задачи — повторяем запрос
+            self._reload_list()
+        elif upserted is not None:
+            self.task_list.upsert(upserted)
+        elif removed is not None:
+            self.task_list.remove(removed)
+        self.redraw.request()
+
+    def _on_db_error(self, message):
+        self.show_status_msg(f"⚠ Ошибка базы данных: {message}", color="#f38ba8", msec=5000)
+        self._reload_list()
+
     def _on_new_task(self):
         self.editor.clear_form()
-        self.task_list.clearSelection()
-        self.task_list.setCurrentItem(None)
+        self.task_list.clear_current()
 
     def toggle_view(self):
         if self.right_stack.currentIndex() == 0:
-            self.draw_diagram()
             self.right_stack.setCurrentIndex(1)
+            self.redraw.show()
         else:
             self.right_stack.setCurrentIndex(0)
 
     def change_zoom(self, delta):
-        new_index = self.zoom_index + delta
-        if 0 <= new_index < len(self.zoom_modes):
-            self.zoom_index = apply_zoom_index(self.zoom_index, new_index)
-            val = self.zoom_modes[self.zoom_index]
-            unit = "день" if val == 1 else "дней"
-            self.zoom_label.setText(f"Масштаб: {val} {unit}/деление")
-            self.draw_diagram()
+        self.zoom.step(delta)
+
+    def _on_zoom_settled(self, zoom_days, anchor_day, anchor_x):
+        self._zoom_anchor = None if math.isnan(anchor_day) else (anchor_day, anchor_x)
+        self.redraw.request()
+
+    def toggle_profiling(self):
+        self.profiler.set_enabled(not self.profiler.enabled)
+        self.show_status_msg("Профилирование диаграммы " +
+                             ("включено" if self.profiler.enabled else "выключено"))
+        self.redraw.request()
+        self.view.viewport().update()
 
     def draw_diagram(self):
-        self.scene.clear()
-        tasks = task_manager.fetch_all_full(self.conn)
+        today = today_day()
+        self._diagram_generation += 1
+        generation = self._diagram_generation
+
+        # Выборка уже в кэше — рисуем сразу, иначе читаем в фоне
+        tasks = self.tasks.peek_timeline(self.timeline_tasks, today)
+        self.profiler.begin(tasks=self.timeline_tasks, zoom_days=round(self.zoom.zoom_days, 3),
+                            ui_scale=self.current_scale, theme=self.current_theme,
+                            cached=tasks is not None)
+        if tasks is not None:
+            self._render_diagram(generation, tasks)
+        else:
+            self.worker.submit(self.tasks.timeline_tasks, self.timeline_tasks, today,
+                               on_done=lambda rows: self._render_diagram(generation, rows))
+
+    def _render_diagram(self, generation, tasks):
+        if generation != self._diagram_generation:
+            # за время запроса диаграмму уже перерисовали
+            return
+        self.profiler.since_begin("fetch", len(tasks))
         viewport_w = max(1, self.view.viewport().width())
         dark_theme = self.current_theme == "dark"
         self.draw_timeline_scaled(tasks, viewport_w, dark_theme)
+        if self.profiler.rendered():
+            # кадр закроет ближайшая отрисовка, даже если сцена не изменилась
+            self.view.viewport().update()
 
     def draw_timeline_scaled(self, tasks, viewport_w, dark_theme):
-        zoom_days = self.zoom_modes[self.zoom_index]
-        draw_timeline(self.scene, tasks, zoom_days, viewport_w,
-                      ui_scale=self.current_scale, dark_theme=dark_theme)
-
-    def _on_scene_selection_changed(self):
-        items = self.scene.selectedItems()
-        if not items:
-            return
-        tid = items[0].data(0)
-        if not tid:
-            return
-
-        # Открываем задачу и переключаемся
-        self.task_list.itemSelected.emit(tid)
-
-        # ВИЗУАЛЬНО выделяем строку в списке
-        for i in range(self.task_list.count()):
-            item = self.task_list.item(i)
-            if item and item.data(QtCore.Qt.UserRole) == tid:
-                self.task_list.setCurrentItem(item)
-                self.task_list.scrollToItem(item)
-                return
-        # Если не нашли - снимаем выделение
-        self.task_list.clearSelection()
+        zoom_days = self.zoom.zoom_days
+        if self.zoom.is_animating():
+            # перерисовка прерывает анимацию (settled не придёт) — якорь берём
+            # сейчас, пока раскладка сцены старая
+            self._zoom_anchor = self.zoom.anchor_day()
+        self.timeline.visible = self._visible_range()
+        self.timeline.render(tasks, tick_step(zoom_days), viewport_w,
+                             ui_scale=self.current_scale, dark_theme=dark_theme,
+                             px_per_day=pixels_per_day(zoom_days, self.current_scale),
+                             row_version=self.tasks.row_version)
+        self.zoom.reset()
+        self._show_zoom(zoom_days)
+
+        # После zoom день под курсором остаётся на том же месте
+        anchor, self._zoom_anchor = self._zoom_anchor, None
+        if anchor is not None:
+            x = self.timeline.x_at(anchor[0])
+            if x is not None:
+                self.view.horizontalScrollBar().setValue(int(round(x - anchor[1])))
+        self._update_visible_range()
+
+    def _show_zoom(self, zoom_days):
+        val = tick_step(zoom_days)
+        unit = "день" if val == 1 else "дней"
+        self.zoom_label.setText(f"Масштаб: {val} {unit}/деление")
+
+    def _visible_range(self):
+        rect = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        return rect.left(), rect.right()
+
+    def _update_visible_range(self, *args):
+        self.timeline.set_visible_range(*self._visible_range())
 
     def open_settings(self):
-        dialog = SettingsDialog(current_scale=self.current_scale, current_theme=self.current_theme)
+        dialog = SettingsDialog(current_scale=self.current_scale, current_theme=self.current_theme,
+                                timeline_tasks=self.timeline_tasks, render_opts=self.render_opts)
         dialog.scaleChanged.connect(self.apply_ui_scale)
+        dialog.renderOptionsChanged.connect(self.apply_render_options)
         dialog.themeChanged.connect(self.apply_theme)
+        dialog.timelineTasksChanged.connect(self.apply_timeline_tasks)
         dialog.exec_()
         self.save_config()
 
@@ -0,0 +1,35 @@
+from PyQt5 import QtCore
+
+
+class RedrawScheduler(QtCore.QObject):
+    """
+    Отложенная перерисовка: request() только помечает диаграмму устаревшей,
+    сама перерисовка выполняется один раз на следующем проходе цикла событий,
+    сколько бы запросов ни пришло до него. Пока is_visible() ложно,
+    перерисовка не выполняется; флаг остаётся до show().
+    """
+
+    def __init__(self, redraw, is_visible, parent=None):
+        super().__init__(parent)
+        self._redraw = redraw
+        self._is_visible = is_visible
+        self.dirty = True
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.flush)
+
+    def request(self):
+        self.dirty = True
+        if self._is_visible() and not self._timer.isActive():
+            self._timer.start()
+
+    def show(self):
+        """Диаграмма стала видимой: перерисовать сразу, если она устарела."""
+        self.flush()
+
+    def flush(self):
+        self._timer.stop()
+        if self.dirty and self._is_visible():
+            self.dirty = False
+            self._redraw()
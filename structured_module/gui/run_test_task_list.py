@@ -0,0 +1,172 @@
+import os
+import random
+import sys
+from collections import deque
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5 import QtCore, QtWidgets
+
+from gui.task_list_widget import TaskListWidget
+
+
+_results = []
+
+
+def check(title, actual, expected):
+    status = "Pass" if actual == expected else "Fail"
+    _results.append(status)
+    print(f"  {title}")
+    print(f"  Ожидалось: {expected!r}, получено: {actual!r} -> {status}")
+
+
+class FakeWorker:
+    """
+    Очередь запросов как у DbWorker: выполняются по одному, по порядку постановки,
+    ответ приходит в GUI-поток позже, из цикла событий.
+    """
+
+    def __init__(self, ids):
+        self.titles = {tid: f"Задача {tid}" for tid in ids}
+        self._queue = deque()
+        self._timer = QtCore.QTimer()
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._step)
+        self._timer.start()
+
+    def submit(self, func, on_done):
+        self._queue.append((func, on_done))
+
+    def idle(self):
+        return not self._queue
+
+    def _step(self):
+        if self._queue:
+            func, on_done = self._queue.popleft()
+            on_done(func())
+
+    # task_manager.fetch_page_min / fetch_page_before над словарём
+    def fetch_page(self, after_id, limit, done):
+        self.submit(lambda: [self._row(t) for t in sorted(self.titles) if t > after_id][:limit], done)
+
+    def fetch_before(self, before_id, limit, done):
+        self.submit(lambda: [self._row(t) for t in sorted(self.titles) if t < before_id][-limit:],
+                    done)
+
+    def _row(self, tid):
+        return {"id": tid, "title": self.titles[tid]}
+
+
+def _wait(app, worker):
+    for _ in range(200):
+        app.processEvents()
+        if worker.idle():
+            break
+    app.processEvents()
+
+
+def _invariants(model, worker):
+    """Ошибки согласованности строк модели, индекса и "базы"."""
+    rows = model._rows
+    ids = [r["id"] for r in rows]
+    errors = []
+    if len(set(ids)) != len(ids):
+        errors.append("повторяющиеся строки")
+    if model._by_id and ids != sorted(ids):
+        errors.append("строки не по возрастанию id")
+    if model._index != {tid: i for i, tid in enumerate(ids)}:
+        errors.append("индекс не совпадает со строками")
+    stale = [r["id"] for r in rows if worker.titles.get(r["id"]) != r["title"]]
+    if stale:
+        errors.append(f"устаревшие строки: {stale[:5]}")
+    return errors
+
+
+def case_random_ops(app, seed, steps=300):
+    rnd = random.Random(seed)
+    worker = FakeWorker(range(1, 1501))
+    widget = TaskListWidget()
+    widget.resize(240, 300)
+    widget.show()
+    widget.set_source(worker.fetch_page, worker.fetch_before)
+    model = widget.model()
+    next_id = 1501
+    errors = []
+
+    for step in range(steps):
+        op = rnd.choice(("create", "rename", "delete", "select", "scroll", "reload", "more"))
+        if op == "create":
+            tid, next_id = next_id, next_id + 1
+
+            def create(tid=tid):
+                worker.titles[tid] = f"Задача {tid}"
+                return tid
+            worker.submit(create, lambda tid: widget.upsert({"id": tid, "title": worker.titles[tid]}))
+        elif op == "rename" and worker.titles:
+            tid = rnd.choice(list(worker.titles))
+            title = f"Задача {tid} ({step})"
+            worker.submit(lambda: worker.titles.__setitem__(tid, title),
+                          lambda _: widget.upsert({"id": tid, "title": title}))
+        elif op == "delete" and worker.titles:
+            tid = rnd.choice(list(worker.titles))
+            widget.remove(tid)
+            worker.submit(lambda: worker.titles.pop(tid, None), lambda _: widget.remove(tid))
+        elif op == "select":
+            widget.select_task(rnd.randint(1, next_id))
+        elif op == "scroll":
+            bar = widget.verticalScrollBar()
+            bar.setValue(rnd.choice((bar.minimum(), bar.maximum(), rnd.randint(0, bar.maximum()))))
+        elif op == "reload":
+            widget.reload()
+        elif op == "more":
+            model.fetchMore()
+        _wait(app, worker)
+        errors = _invariants(model, worker)
+        if errors:
+            errors = [f"шаг {step} ({op}): {e}" for e in errors]
+            break
+
+    check(f"случайные операции (seed={seed}): строки уникальны, по id, индекс верен", errors, [])
+    widget.close()
+
+
+def case_anchor(app):
+    worker = FakeWorker(range(1, 2001))
+    widget = TaskListWidget()
+    widget.resize(240, 300)
+    widget.show()
+    widget.set_source(worker.fetch_page, worker.fetch_before)
+    model = widget.model()
+    _wait(app, worker)
+    widget.select_task(1400)
+    _wait(app, worker)
+    check("переход к дальней задаче не читает таблицу с начала", len(model._rows) <= 400, True)
+    check("задача выделена", widget.currentIndex().data(QtCore.Qt.UserRole), 1400)
+    check("согласованность после anchor", _invariants(model, worker), [])
+    widget.reload()
+    _wait(app, worker)
+    check("согласованность после reload", _invariants(model, worker), [])
+    check("reload начинает с первой задачи", model._rows[0]["id"], 1)
+    widget.close()
+
+
+def run_tests():
+    print("=== ЗАПУСК ТЕСТИРОВАНИЯ СПИСКА ЗАДАЧ ===\n")
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    print("Тест-кейс 1: Переход к задаче за пределами загруженных страниц")
+    case_anchor(app)
+    print()
+    print("Тест-кейс 2: upsert/remove/выделение/прокрутка/reload с асинхронной подгрузкой")
+    for seed in range(1, 6):
+        case_random_ops(app, seed)
+    print()
+
+    passed = _results.count("Pass")
+    print(f"=== ИТОГ: Пройдено {passed} из {len(_results)} проверок ===")
+    return passed == len(_results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_tests() else 1)
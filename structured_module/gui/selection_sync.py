@@ -0,0 +1,63 @@
+from PyQt5 import QtCore
+
+
+class SelectionSync(QtCore.QObject):
+    """
+    Согласует выделение задачи в TaskListWidget и на диаграмме.
+
+    Обе стороны ищут задачу по id в своих индексах (строка модели списка,
+    бар TimelineRenderer), без перебора. Выбор пользователя с любой стороны
+    выдаётся одним taskSelected; встречное выделение, выставленное самим
+    сервисом, сигналов не порождает.
+    """
+
+    taskSelected = QtCore.pyqtSignal(int)
+
+    def __init__(self, task_list, timeline, scene, parent=None):
+        super().__init__(parent)
+        self.task_list = task_list
+        self.timeline = timeline
+        self.scene = scene
+        self._syncing = False
+        task_list.itemSelected.connect(self._from_list)
+        scene.selectionChanged.connect(self._from_scene)
+
+    def detach(self):
+        """Отключается от сцены (перед её удалением)."""
+        try:
+            self.scene.selectionChanged.disconnect(self._from_scene)
+        except TypeError:
+            pass
+
+    def _from_list(self, task_id):
+        self._syncing = True
+        try:
+            self._select_bar(task_id)
+        finally:
+            self._syncing = False
+        self.taskSelected.emit(task_id)
+
+    def _from_scene(self):
+        if self._syncing:
+            return
+        items = self.scene.selectedItems()
+        if not items:
+            return
+        task_id = items[0].data(0)
+        if not task_id:
+            return
+        self._syncing = True
+        try:
+            # строка выделяется без itemSelected — задачу откроет taskSelected
+            self.task_list.select_task(task_id)
+        finally:
+            self._syncing = False
+        self.taskSelected.emit(task_id)
+
+    def _select_bar(self, task_id):
+        bar = self.timeline.item_of(task_id)
+        if bar is not None and bar.isSelected():
+            return
+        self.scene.clearSelection()
+        if bar is not None:
+            bar.setSelected(True)
@@ -1,31 +1,388 @@
+from bisect import bisect_left
+
 from PyQt5 import QtWidgets, QtCore
 
 
-class TaskListWidget(QtWidgets.QListWidget):
+EMPTY_TEXT = "(Нет задач)"
+NOT_FOUND_TEXT = "(Ничего не найдено)"
+
+
+class TaskListModel(QtCore.QAbstractListModel):
+    """
+    Ленивая модель списка задач.
+    Строки подгружаются страницами через fetch_page(after_id, limit, done),
+    поэтому перезагрузка не зависит от общего числа задач в базе.
+    fetch_page может вызвать done(page) сразу или позже (из фонового запроса).
+    С fetch_before(before_id, limit, done) модель умеет встать окном на любую
+    задачу (anchor) и догружать строки выше окна — не читая таблицу с начала.
+    Индекс id -> номер строки поддерживается при каждой загрузке (row_of за O(1)).
+    upsert()/remove() меняют одну строку без перезагрузки, выделение и прокрутка
+    view при этом сохраняются.
+    """
+    PAGE_SIZE = 200
+
+    pageLoaded = QtCore.pyqtSignal()
+
+    def __init__(self, fetch_page=None, page_size=PAGE_SIZE, parent=None, fetch_before=None):
+        super().__init__(parent)
+        self._fetch_page = fetch_page
+        self._fetch_before = fetch_before
+        self._page_size = page_size
+        self._rows = []
+        self._index = {}  # id задачи -> номер строки
+        self._by_id = True  # строки отсортированы по id (постраничный режим)
+        self._exhausted = fetch_page is None
+        self._loading = False
+        # Начало окна: строки выше него имеют id < _head_id
+        self._head_exhausted = True
+        self._head_id = 0
+        self._loading_head = False
+        self._generation = 0
+        self._empty_text = EMPTY_TEXT
+
+    def set_source(self, fetch_page, fetch_before=None):
+        self._fetch_page = fetch_page
+        self._fetch_before = fetch_before
+        self.reload()
+
+    def reload(self):
+        self.beginResetModel()
+        self._generation += 1
+        self._rows = []
+        self._index = {}
+        self._by_id = True
+        self._exhausted = self._fetch_page is None
+        self._loading = False
+        self._head_exhausted = True
+        self._head_id = 0
+        self._loading_head = False
+        self._empty_text = EMPTY_TEXT
+        self.endResetModel()
+        self.fetchMore()
+
+    def can_anchor(self):
+        return self._by_id and self._fetch_page is not None and self._fetch_before is not None
+
+    def anchor(self, task_id):
+        """
+        Перестраивает окно строк вокруг задачи: страница с id >= task_id,
+        затем страница перед ней. Стоимость не зависит от позиции задачи в таблице.
+        """
+        self.beginResetModel()
+        self._generation += 1
+        self._rows = []
+        self._index = {}
+        self._exhausted = False
+        self._loading = False
+        self._head_exhausted = task_id <= 1
+        self._head_id = task_id
+        self._loading_head = False
+        self._empty_text = EMPTY_TEXT
+        self.endResetModel()
+        self._fetch_tail(task_id - 1)
+
+    def set_rows(self, rows, empty_text=NOT_FOUND_TEXT):
+        """Показывает готовый список (например, результаты поиска) без подгрузки."""
+        self.beginResetModel()
+        self._generation += 1
+        self._rows = list(rows)
+        self._index = {r["id"]: i for i, r in enumerate(self._rows)}
+        self._by_id = False
+        self._exhausted = True
+        self._loading = False
+        self._head_exhausted = True
+        self._head_id = 0
+        self._loading_head = False
+        self._empty_text = empty_text
+        self.endResetModel()
+
+    def is_empty(self):
+        return self._exhausted and self._head_exhausted and not self._rows
+
+    def set_title(self, task_id, title):
+        """Меняет название загруженной строки (без обращения к БД)."""
+        row = self.row_of(task_id)
+        if row is None:
+            return
+        self._rows[row] = dict(self._rows[row], title=title)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [QtCore.Qt.DisplayRole])
+
+    def upsert(self, row):
+        """
+        Обновляет строку {"id", "title"} или вставляет её на место по id.
+        Задача за последней загруженной страницей не вставляется — она придёт
+        со своей страницей. В готовом списке (set_rows) меняются только
+        имеющиеся строки.
+        """
+        task_id = row["id"]
+        pos = self.row_of(task_id)
+        if pos is not None:
+            self._rows[pos] = dict(row)
+            index = self.index(pos)
+            self.dataChanged.emit(index, index, [QtCore.Qt.DisplayRole])
+            return True
+        if not self._by_id or self.may_contain(task_id):
+            return False
+
+        pos = bisect_left(self._rows, task_id, key=lambda r: r["id"])
+        if not self._rows:
+            # вместо строки-заглушки появляется первая задача
+            self.beginResetModel()
+            self._rows.append(dict(row))
+            self._index[task_id] = 0
+            self.endResetModel()
+            return True
+        self.beginInsertRows(QtCore.QModelIndex(), pos, pos)
+        self._rows.insert(pos, dict(row))
+        self._reindex(pos)
+        self.endInsertRows()
+        return True
+
+    def remove(self, task_id):
+        """Убирает строку задачи, если она загружена."""
+        pos = self._index.pop(task_id, None)
+        if pos is None:
+            return False
+        if len(self._rows) == 1 and self._exhausted and self._head_exhausted:
+            # последняя задача — на её месте будет строка-заглушка
+            self.beginResetModel()
+            self._rows.clear()
+            self.endResetModel()
+            return True
+        self.beginRemoveRows(QtCore.QModelIndex(), pos, pos)
+        del self._rows[pos]
+        self._reindex(pos)
+        self.endRemoveRows()
+        return True
+
+    def _reindex(self, first):
+        """Пересчитывает индекс для строк начиная с first (после вставки или удаления)."""
+        for i in range(first, len(self._rows)):
+            self._index[self._rows[i]["id"]] = i
+
+    # --- QAbstractListModel ---
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return 1 if self.is_empty() else len(self._rows)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if self.is_empty():
+            return self._empty_text if role == QtCore.Qt.DisplayRole else None
+
+        r = self._rows[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return r["title"] or f"Задача {r['id']}"
+        if role == QtCore.Qt.UserRole:
+            return r["id"]
+        return None
+
+    def flags(self, index):
+        if self.is_empty():
+            return QtCore.Qt.NoItemFlags
+        return super().flags(index)
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if not self.canFetchMore(parent) or self._loading:
+            return
+        self._fetch_tail(self._rows[-1]["id"] if self._rows else self._head_id - 1)
+
+    def _fetch_tail(self, after_id):
+        self._loading = True
+        generation = self._generation
+        self._fetch_page(max(0, after_id), self._page_size,
+                         lambda page: self._on_page(generation, page))
+
+    def can_fetch_head(self):
+        return not self._head_exhausted and bool(self._rows)
+
+    def fetch_head(self):
+        """Догружает страницу строк перед началом окна (после anchor)."""
+        if self.can_fetch_head():
+            self._load_head()
+
+    def _load_head(self):
+        if self._loading_head:
+            return
+        self._loading_head = True
+        generation = self._generation
+        self._fetch_before(self._head_id, self._page_size,
+                           lambda page: self._on_head_page(generation, page))
+
+    def _on_head_page(self, generation, page):
+        if generation != self._generation:
+            return
+        if len(page) < self._page_size:
+            self._head_exhausted = True
+        if page:
+            self._head_id = page[0]["id"]
+            self.beginInsertRows(QtCore.QModelIndex(), 0, len(page) - 1)
+            self._rows[:0] = page
+            self._reindex(0)
+            self.endInsertRows()
+        elif self.is_empty():
+            self.beginResetModel()
+            self.endResetModel()
+        # флаг снимается только после вставки: view может запросить страницу во время неё
+        self._loading_head = False
+        self.pageLoaded.emit()
+
+    def _on_page(self, generation, page):
+        if generation != self._generation:
+            # ответ на запрос до reload() — устарел
+            return
+        if len(page) < self._page_size:
+            self._exhausted = True
+
+        # первая страница окна после anchor — следом подгружаем страницу перед ним
+        window_start = not self._rows and not self._head_exhausted
+        if page:
+            first = len(self._rows)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(page) - 1)
+            self._rows.extend(page)
+            self._index.update((r["id"], first + i) for i, r in enumerate(page))
+            self.endInsertRows()
+        elif self.is_empty():
+            # Пустая база — показываем строку-заглушку
+            self.beginResetModel()
+            self.endResetModel()
+        # Пока строки вставляются, fetchMore() от view не должен запросить ту же страницу
+        self._loading = False
+        self.pageLoaded.emit()
+        if window_start:
+            self._load_head()
+
+    # --- Поиск строки ---
+    def row_of(self, task_id):
+        """Номер загруженной строки задачи или None."""
+        return self._index.get(task_id)
+
+    def may_contain(self, task_id):
+        """Может ли задача оказаться в ещё не загруженных страницах."""
+        if not self._head_exhausted and task_id < self._head_id:
+            return True
+        return not self._exhausted and (not self._rows or self._rows[-1]["id"] < task_id)
+
+    def near_tail(self, task_id):
+        """Задача, скорее всего, в следующей странице (id идут почти подряд)."""
+        last = self._rows[-1]["id"] if self._rows else self._head_id - 1
+        return not self._exhausted and last < task_id <= last + self._page_size
+
+
+class TaskListWidget(QtWidgets.QListView):
     itemSelected = QtCore.pyqtSignal(int)
 
     def __init__(self):
         super().__init__()
-        self.itemClicked.connect(self._click)
+        self._model = TaskListModel(parent=self)
+        self._pending_select = None
+        self.setModel(self._model)
+        self.setUniformItemSizes(True)
+        # Прокрутка по строкам: значение полосы — номер верхней видимой строки
+        self.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerItem)
+        self.clicked.connect(self._click)
+        self._model.pageLoaded.connect(self._on_page_loaded)
+        # Строки, вставленные выше видимой области, не сдвигают её содержимое
+        self._top_row = None
+        self._model.rowsAboutToBeInserted.connect(self._remember_top)
+        self._model.rowsInserted.connect(self._restore_top)
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+    def set_source(self, fetch_page, fetch_before=None):
+        """
+        fetch_page(after_id, limit, done): done(список {"id", "title"}, отсортированный по id).
+        fetch_before(before_id, limit, done) — то же для строк с id < before_id;
+        без него выделение задачи далеко за загруженными страницами не выполняется.
+        """
+        self._pending_select = None
+        self._model.set_source(fetch_page, fetch_before)
+
+    def reload(self):
+        self._pending_select = None
+        self._model.reload()
+
+    def show_rows(self, rows):
+        self._pending_select = None
+        self._model.set_rows(rows)
+        self.setEnabled(not self._model.is_empty())
+
+    def set_title(self, task_id, title):
+        self._model.set_title(task_id, title)
+
+    def upsert(self, row):
+        """Обновляет или добавляет одну строку {"id", "title"}."""
+        if self._model.upsert(row):
+            self.setEnabled(True)
+
+    def remove(self, task_id):
+        """Убирает строку задачи; выделение остальных строк и прокрутка не сбрасываются."""
+        if self._pending_select == task_id:
+            self._pending_select = None
+        if self._model.remove(task_id):
+            self.setEnabled(not self._model.is_empty())
+
+    def select_task(self, task_id):
+        """
+        Выделяет строку задачи. Если строка ещё не загружена, выделение
+        произойдёт после подгрузки нужной страницы.
+        """
+        self._pending_select = None
+        row = self._model.row_of(task_id)
+        if row is not None:
+            index = self._model.index(row)
+            self.setCurrentIndex(index)
+            self.scrollTo(index)
+            return True
+        if self._model.may_contain(task_id):
+            if self._model.near_tail(task_id):
+                self._pending_select = task_id
+                self._model.fetchMore()
+                return True
+            if self._model.can_anchor():
+                # не листаем таблицу до задачи, а встаём окном прямо на неё
+                self._pending_select = task_id
+                self._model.anchor(task_id)
+                return True
+        self.clearSelection()
+        return False
+
+    def clear_current(self):
+        self._pending_select = None
+        self.clearSelection()
+        self.setCurrentIndex(QtCore.QModelIndex())
+
+    def _on_page_loaded(self):
+        self.setEnabled(not self._model.is_empty())
+        if self._pending_select is not None:
+            self.select_task(self._pending_select)
 
-    def load(self, rows):
-        self.clear()
+    def _on_scrolled(self, value):
+        if value == self.verticalScrollBar().minimum() and self._model.can_fetch_head():
+            self._model.fetch_head()
 
-        if not rows:
-            self.addItem("(Нет задач)")
-            self.setEnabled(False)
+    def _remember_top(self, parent, first, last):
+        # Не indexAt(): он выполняет отложенную раскладку view посреди вставки
+        if self._model.is_empty() or not self._model.rowCount():
+            self._top_row = None
             return
+        top = self.verticalScrollBar().value()
+        self._top_row = top if first <= top else None
 
-        self.setEnabled(True)
-        for r in rows:
-            title = r["title"] or f"Задача {r['id']}"
-            item = QtWidgets.QListWidgetItem(title)
-            item.setData(QtCore.Qt.UserRole, r["id"])
-            self.addItem(item)
+    def _restore_top(self, parent, first, last):
+        if self._top_row is not None:
+            self.scrollTo(self._model.index(self._top_row + last - first + 1),
+                          QtWidgets.QAbstractItemView.PositionAtTop)
+            self._top_row = None
 
-    def _click(self, item):
-        if item.text() == "(Нет задач)":
+    def _click(self, index):
+        if self._model.is_empty():
             return
-        tid = item.data(QtCore.Qt.UserRole)
+        tid = index.data(QtCore.Qt.UserRole)
         if tid:
             self.itemSelected.emit(tid)
@@ -0,0 +1,88 @@
+import itertools
+import queue
+import traceback
+
+from PyQt5 import QtCore
+
+from logic import task_manager
+
+
+class DbRequest:
+    """Запрос к БД: функция, которая будет выполнена в потоке воркера."""
+    __slots__ = ("request_id", "func", "args", "kwargs")
+
+    def __init__(self, request_id, func, args=(), kwargs=None):
+        self.request_id = request_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+
+
+class DbWorker(QtCore.QThread):
+    """
+    Поток, который владеет соединением с БД и выполняет запросы по очереди.
+    Результаты возвращаются в GUI-поток через сигналы, поэтому окно
+    не ждёт SQLite (например, когда база лежит на сетевом диске).
+
+    Функции запросов получают соединение через ConnectionManager.get(),
+    и в потоке воркера это всегда его собственное соединение.
+    """
+    # не finished: это имя у QThread уже занято сигналом завершения потока
+    succeeded = QtCore.pyqtSignal(int, object)
+    failed = QtCore.pyqtSignal(int, str)
+
+    def __init__(self, db: task_manager.ConnectionManager, parent=None):
+        super().__init__(parent)
+        self._db = db
+        self._queue = queue.Queue()
+        self._ids = itertools.count(1)
+        self._callbacks = {}
+        self.succeeded.connect(self._on_succeeded)
+        self.failed.connect(self._on_failed)
+
+    def submit(self, func, *args, on_done=None, on_error=None, **kwargs) -> int:
+        """
+        Ставит func(*args, **kwargs) в очередь. on_done(result) и on_error(message)
+        вызываются в GUI-потоке. Возвращает номер запроса.
+        """
+        request_id = next(self._ids)
+        self._callbacks[request_id] = (on_done, on_error)
+        self._queue.put(DbRequest(request_id, func, args, kwargs))
+        return request_id
+
+    def query(self, func, *args, on_done=None, on_error=None, **kwargs) -> int:
+        """Как submit, но func получает соединение воркера первым аргументом (для task_manager.*)."""
+        return self.submit(self._with_conn, func, *args, on_done=on_done, on_error=on_error, **kwargs)
+
+    def _with_conn(self, func, *args, **kwargs):
+        return func(self._db.get(), *args, **kwargs)
+
+    def stop(self):
+        """Дожидается выполнения уже поставленных запросов и завершает поток."""
+        self._queue.put(None)
+        self.wait()
+
+    def run(self):
+        self._db.get()
+        while True:
+            request = self._queue.get()
+            if request is None:
+                break
+            try:
+                result = request.func(*request.args, **request.kwargs)
+            except Exception as e:
+                traceback.print_exc()
+                self.failed.emit(request.request_id, str(e))
+            else:
+                self.succeeded.emit(request.request_id, result)
+        self._db.release()
+
+    def _on_succeeded(self, request_id, result):
+        on_done, _ = self._callbacks.pop(request_id, (None, None))
+        if on_done:
+            on_done(result)
+
+    def _on_failed(self, request_id, message):
+        _, on_error = self._callbacks.pop(request_id, (None, None))
+        if on_error:
+            on_error(message)
@@ -0,0 +1,134 @@
+"""
+Версионные миграции схемы БД.
+Номер применённой миграции хранится в PRAGMA user_version;
+каждая миграция выполняется в своей транзакции вместе с записью номера.
+"""
+import sqlite3
+
+# 2000-01-01 в юлианских днях: номер дня = julianday(дата) - DAY_EPOCH_JD.
+# Та же "эпоха", что и у сетки таймлайна (align_to_step).
+DAY_EPOCH_JD = 2451544.5
+
+
+# 1. Базовая таблица задач
+BASE_SQL = """
+CREATE TABLE IF NOT EXISTS tasks(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    s_text TEXT,
+    m_text TEXT,
+    a_text TEXT,
+    r_text TEXT,
+    start_date DATE,
+    end_date DATE
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_start_date ON tasks(start_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_end_date ON tasks(end_date);
+"""
+
+# 2. Полнотекстовый индекс по названию и пунктам SMART.
+# Внешний контент (content='tasks'): тексты не дублируются, индекс
+# синхронизируется триггерами.
+FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    title, s_text, m_text, a_text, r_text,
+    content='tasks', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts(rowid, title, s_text, m_text, a_text, r_text)
+    VALUES (new.id, new.title, new.s_text, new.m_text, new.a_text, new.r_text);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, title, s_text, m_text, a_text, r_text)
+    VALUES ('delete', old.id, old.title, old.s_text, old.m_text, old.a_text, old.r_text);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, title, s_text, m_text, a_text, r_text)
+    VALUES ('delete', old.id, old.title, old.s_text, old.m_text, old.a_text, old.r_text);
+    INSERT INTO tasks_fts(rowid, title, s_text, m_text, a_text, r_text)
+    VALUES (new.id, new.title, new.s_text, new.m_text, new.a_text, new.r_text);
+END;
+-- Индексируем задачи, созданные до появления поиска
+INSERT INTO tasks_fts(tasks_fts) VALUES('rebuild');
+"""
+
+# 3. Целочисленные номера дней (дни от 2000-01-01).
+# Вычисляемые колонки не хранятся в строке, но индексируются,
+# поэтому сравнения дат в запросах — целочисленные.
+DAY_COLUMNS_SQL = f"""
+ALTER TABLE tasks ADD COLUMN start_day INTEGER
+    GENERATED ALWAYS AS (CAST(julianday(start_date) - {DAY_EPOCH_JD} AS INTEGER)) VIRTUAL;
+ALTER TABLE tasks ADD COLUMN end_day INTEGER
+    GENERATED ALWAYS AS (CAST(julianday(end_date) - {DAY_EPOCH_JD} AS INTEGER)) VIRTUAL;
+CREATE INDEX IF NOT EXISTS idx_tasks_start_day ON tasks(start_day);
+CREATE INDEX IF NOT EXISTS idx_tasks_end_day ON tasks(end_day);
+DROP INDEX IF EXISTS idx_tasks_start_date;
+DROP INDEX IF EXISTS idx_tasks_end_date;
+"""
+
+
+def _base(conn):
+    return BASE_SQL
+
+
+def _fts(conn):
+    if has_fts(conn):
+        # таблица уже создана (база до появления миграций)
+        return ""
+    if not fts5_available(conn):
+        # SQLite собран без FTS5 — поиск работает через LIKE
+        return ""
+    return FTS_SQL
+
+
+def _day_columns(conn):
+    if has_day_columns(conn):
+        return ""
+    return DAY_COLUMNS_SQL
+
+
+# (версия, функция, возвращающая SQL миграции для этой базы)
+MIGRATIONS = [
+    (1, _base),
+    (2, _fts),
+    (3, _day_columns),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Применяет все ещё не применённые миграции."""
+    current = schema_version(conn)
+    for version, make_sql in MIGRATIONS:
+        if version <= current:
+            continue
+        sql = make_sql(conn)
+        try:
+            conn.executescript(f"BEGIN;\n{sql}\nPRAGMA user_version = {version};\nCOMMIT;")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+
+def has_fts(conn) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='tasks_fts'").fetchone()
+    return row is not None
+
+
+def has_day_columns(conn) -> bool:
+    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(tasks)")}
+    return "start_day" in columns
+
+
+def fts5_available(conn) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM pragma_compile_options WHERE compile_options = 'ENABLE_FTS5'"
+    ).fetchone()
+    return row is not None
@@ -0,0 +1,160 @@
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import migrations, task_manager
+
+
+TASKS = [
+    ("Отчёт", "1999-12-31", "2000-01-01"),
+    ("Високосный год", "2024-02-28", "2024-03-01"),
+    ("Длинная цель", "2026-10-18", "2027-10-18"),
+]
+
+_results = []
+
+
+def check(title, actual, expected):
+    status = "Pass" if actual == expected else "Fail"
+    _results.append(status)
+    print(f"  {title}")
+    print(f"  Ожидалось: {expected!r}, получено: {actual!r} -> {status}")
+
+
+def _old_db(path, with_fts=False):
+    """База в том виде, в каком её оставляли версии до миграций (user_version = 0)."""
+    conn = sqlite3.connect(path)
+    conn.executescript(migrations.BASE_SQL)
+    if with_fts and migrations.fts5_available(conn):
+        # поиск уже был, миграций ещё нет
+        conn.executescript(migrations.FTS_SQL)
+    conn.executemany("INSERT INTO tasks(title, s_text, start_date, end_date) VALUES(?,?,?,?)",
+                     [(title, "пункт S", sd, ed) for title, sd, ed in TASKS])
+    conn.commit()
+    conn.close()
+
+
+def _day_columns(conn):
+    """(номера дней из колонок БД, номера дней по to_day) для всех задач."""
+    rows = conn.execute("SELECT start_date, end_date, start_day, end_day FROM tasks ORDER BY id").fetchall()
+    return ([(r[2], r[3]) for r in rows],
+            [(task_manager.to_day(r[0]), task_manager.to_day(r[1])) for r in rows])
+
+
+def case_baseline(tmp):
+    print("Тест-кейс 1: Миграция базы без миграций (user_version = 0)")
+    path = os.path.join(tmp, "baseline.db")
+    _old_db(path)
+    conn = task_manager.connect(path)
+    task_manager.ensure_schema(conn)
+    check("user_version", migrations.schema_version(conn), migrations.SCHEMA_VERSION)
+    actual, expected = _day_columns(conn)
+    check("start_day/end_day совпадают с to_day", actual, expected)
+    if migrations.has_fts(conn):
+        found = [r["title"] for r in task_manager.search_tasks(conn, "високосный")]
+        check("старые задачи находятся поиском", found, ["Високосный год"])
+    conn.close()
+
+
+def case_existing_fts(tmp):
+    print("Тест-кейс 2: База, где tasks_fts уже создана (поиск до миграций)")
+    path = os.path.join(tmp, "fts.db")
+    _old_db(path, with_fts=True)
+    conn = task_manager.connect(path)
+    task_manager.ensure_schema(conn)
+    check("user_version", migrations.schema_version(conn), migrations.SCHEMA_VERSION)
+    triggers = conn.execute(
+        "SELECT count(*) FROM sqlite_master WHERE type='trigger' AND name LIKE 'tasks_fts_%'"
+    ).fetchone()[0]
+    check("триггеры FTS не задвоены", triggers, 3 if migrations.has_fts(conn) else 0)
+    if migrations.has_fts(conn):
+        task_manager.update_task(conn, 1, {"title": "Годовой отчёт", "start_date": "1999-12-31",
+                                           "end_date": "2000-01-01"})
+        found = [r["id"] for r in task_manager.search_tasks(conn, "годовой")]
+        check("поиск видит изменение после миграции", found, [1])
+    actual, expected = _day_columns(conn)
+    check("start_day/end_day совпадают с to_day", actual, expected)
+    conn.close()
+
+
+def case_rerun(tmp):
+    print("Тест-кейс 3: Повторный запуск миграций после последней")
+    path = os.path.join(tmp, "rerun.db")
+    _old_db(path)
+    conn = task_manager.connect(path)
+    task_manager.ensure_schema(conn)
+    schema_sql = "SELECT type, name, sql FROM sqlite_master ORDER BY name"
+    schema = [tuple(r) for r in conn.execute(schema_sql)]
+    task_manager.ensure_schema(conn)
+    check("user_version не меняется", migrations.schema_version(conn), migrations.SCHEMA_VERSION)
+    check("схема не меняется", [tuple(r) for r in conn.execute(schema_sql)] == schema, True)
+    check("задачи на месте", conn.execute("SELECT count(*) FROM tasks").fetchone()[0], len(TASKS))
+    conn.close()
+
+
+def case_new_rows(tmp):
+    print("Тест-кейс 4: Номера дней у задач, созданных после миграции")
+    path = os.path.join(tmp, "new.db")
+    conn = task_manager.connect(path)
+    task_manager.ensure_schema(conn)
+    for title, sd, ed in TASKS:
+        task_manager.create_task(conn, {"title": title, "start_date": sd, "end_date": ed})
+    actual, expected = _day_columns(conn)
+    check("start_day/end_day совпадают с to_day", actual, expected)
+    conn.close()
+
+
+def _payload(title):
+    return {"title": title, "start_date": "2026-01-01", "end_date": "2026-01-02"}
+
+
+def _titles_of(conn, ids):
+    return [conn.execute("SELECT title FROM tasks WHERE id=?", (tid,)).fetchone()[0] for tid in ids]
+
+
+def case_bulk_ids(tmp):
+    print("Тест-кейс 5: create_tasks возвращает id вставленных строк (id пачки идут подряд)")
+    path = os.path.join(tmp, "bulk.db")
+    conn = task_manager.connect(path)
+    task_manager.ensure_schema(conn)
+    first = task_manager.create_tasks(conn, [_payload(f"a{i}") for i in range(5)])
+    # дыра в id: удалены последние строки, AUTOINCREMENT их не переиспользует
+    task_manager.delete_tasks(conn, first[-2:])
+    payloads = [_payload(f"b{i}") for i in range(7)]
+    ids = task_manager.create_tasks(conn, payloads, chunk_size=3)
+    check("id соответствуют payloads (пачки по 3)", _titles_of(conn, ids),
+          [p["title"] for p in payloads])
+    ids = task_manager.create_tasks(conn, [_payload("c")], chunk_size=None)
+    check("одна пачка без разбиения", _titles_of(conn, ids), ["c"])
+
+    # чужая незафиксированная запись не должна попасть в commit массовой операции
+    conn.execute("UPDATE tasks SET title='черновик' WHERE id=?", (ids[0],))
+    try:
+        task_manager.create_tasks(conn, [_payload("d")])
+        raised = False
+    except sqlite3.ProgrammingError:
+        raised = True
+    check("внутри открытой транзакции — ошибка", raised, True)
+    conn.rollback()
+    check("транзакция вызывающего не зафиксирована", _titles_of(conn, ids), ["c"])
+    conn.close()
+
+
+def run_tests():
+    print("=== ЗАПУСК ТЕСТИРОВАНИЯ ХРАНИЛИЩА ===\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        for case in (case_baseline, case_existing_fts, case_rerun, case_new_rows,
+                     case_bulk_ids):
+            case(tmp)
+            print()
+
+    passed = _results.count("Pass")
+    print(f"=== ИТОГ: Пройдено {passed} из {len(_results)} проверок ===")
+    return passed == len(_results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_tests() else 1)
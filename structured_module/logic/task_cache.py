@@ -0,0 +1,158 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from logic import task_manager
+
+
+class TaskCache:
+    """
+    Write-through кэш задач между GUI и task_manager.
+
+    - get() отдаёт задачу из памяти, при промахе читает одну строку из БД;
+      редко используемые задачи вытесняются (LRU, не больше capacity строк).
+    - create/update/delete сначала пишут в БД, затем обновляют кэш.
+    - Каждое изменение увеличивает общий номер версии; для каждой задачи
+      хранится версия её последнего изменения (см. changes_since).
+    - Выборка для диаграммы запоминается до следующего изменения.
+    """
+
+    def __init__(self, db: task_manager.ConnectionManager, capacity: int = 2048):
+        self._db = db
+        self._capacity = capacity
+        self._rows = OrderedDict()
+        self._row_versions = {}
+        self._deleted = set()
+        self._timeline = {}
+        self._lock = threading.RLock()
+        self.version = 0
+
+    # Чтение
+    def get(self, task_id: int) -> Optional[Dict]:
+        with self._lock:
+            row = self._rows.get(task_id)
+            if row is not None:
+                self._rows.move_to_end(task_id)
+                return dict(row)
+
+        row = task_manager.fetch_one(self._db.get(), task_id)
+        if row is not None:
+            with self._lock:
+                self._put(row)
+        return dict(row) if row else None
+
+    def peek(self, task_id: int) -> Optional[Dict]:
+        """Задача из памяти без обращения к БД (None при промахе)."""
+        with self._lock:
+            row = self._rows.get(task_id)
+            return dict(row) if row is not None else None
+
+    def peek_timeline(self, limit: int, today: int) -> Optional[List[Dict]]:
+        """Запомненная выборка для диаграммы, если она ещё актуальна, иначе None."""
+        with self._lock:
+            cached = self._timeline.get((limit, today))
+            if cached and cached[0] == self.version:
+                return [dict(r) for r in cached[1]]
+            return None
+
+    def timeline_tasks(self, limit: int, today: int) -> List[Dict]:
+        key = (limit, today)
+        with self._lock:
+            cached = self._timeline.get(key)
+            if cached and cached[0] == self.version:
+                return [dict(r) for r in cached[1]]
+            version = self.version
+
+        rows = task_manager.fetch_timeline_tasks(self._db.get(), limit, today)
+        with self._lock:
+            if version == self.version:
+                self._timeline = {key: (version, rows)}
+                for row in rows:
+                    self._put(row)
+        return [dict(r) for r in rows]
+
+    # Запись
+    def create(self, payload: Dict) -> int:
+        conn = self._db.get()
+        task_id = task_manager.create_task(conn, payload)
+        # Перечитываем строку: вычисляемые колонки (start_day, end_day) считает SQLite
+        self._changed([task_id], [task_manager.fetch_one(conn, task_id)])
+        return task_id
+
+    def update(self, task_id: int, payload: Dict):
+        conn = self._db.get()
+        task_manager.update_task(conn, task_id, payload)
+        row = task_manager.fetch_one(conn, task_id)
+        self._changed([task_id], [row] if row else None)
+
+    def delete(self, task_id: int):
+        task_manager.delete_task(self._db.get(), task_id)
+        self._removed([task_id])
+
+    def create_many(self, payloads: List[Dict], **kwargs) -> List[int]:
+        payloads = list(payloads)
+        ids = task_manager.create_tasks(self._db.get(), payloads, **kwargs)
+        self._changed(ids, None)
+        return ids
+
+    def update_many(self, payloads: List[Dict], **kwargs) -> List[int]:
+        ids = task_manager.update_tasks(self._db.get(), payloads, **kwargs)
+        self._changed(ids, None)
+        return ids
+
+    def delete_many(self, task_ids: List[int], **kwargs) -> List[int]:
+        ids = task_manager.delete_tasks(self._db.get(), task_ids, **kwargs)
+        self._removed(ids)
+        return ids
+
+    # Версии
+    def row_version(self, task_id: int) -> int:
+        """Версия последнего изменения задачи (0 — не менялась за время работы кэша)."""
+        with self._lock:
+            return self._row_versions.get(task_id, 0)
+
+    def changes_since(self, version: int) -> Tuple[List[int], List[int]]:
+        """(изменённые или созданные id, удалённые id) после указанной версии."""
+        with self._lock:
+            changed, deleted = [], []
+            for tid, v in self._row_versions.items():
+                if v > version:
+                    (deleted if tid in self._deleted else changed).append(tid)
+            return changed, deleted
+
+    def invalidate(self):
+        """Сбрасывает кэш строк (например, после изменения БД в обход кэша)."""
+        with self._lock:
+            self._rows.clear()
+            self._timeline = {}
+            self.version += 1
+
+    # Внутреннее
+    def _put(self, row: Dict):
+        tid = row["id"]
+        self._rows[tid] = {k: row.get(k) for k in task_manager.FULL_COLUMNS}
+        self._rows.move_to_end(tid)
+        while len(self._rows) > self._capacity:
+            self._rows.popitem(last=False)
+
+    def _changed(self, ids, rows):
+        with self._lock:
+            self.version += 1
+            self._timeline = {}
+            for tid in ids:
+                self._row_versions[tid] = self.version
+                self._deleted.discard(tid)
+                if rows is None:
+                    # массовое изменение — строку перечитаем при следующем get()
+                    self._rows.pop(tid, None)
+            for row in rows or ():
+                self._put(row)
+
+    def _removed(self, ids):
+        with self._lock:
+            self.version += 1
+            self._timeline = {}
+            for tid in ids:
+                self._row_versions[tid] = self.version
+                self._deleted.add(tid)
+                self._rows.pop(tid, None)
@@ -1,29 +1,118 @@
+import os
 import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
 from typing import List, Dict, Optional
 
-SCHEMA_SQL = """
-CREATE TABLE IF NOT EXISTS tasks(
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    title TEXT NOT NULL,
-    s_text TEXT,
-    m_text TEXT,
-    a_text TEXT,
-    r_text TEXT,
-    start_date DATE,
-    end_date DATE
-);
-"""
-
-
-def connect(db_file: str):
-    conn = sqlite3.connect(db_file)
+from logic import migrations
+from logic.migrations import has_fts
+
+FULL_COLUMNS = ("id", "title", "s_text", "m_text", "a_text", "r_text", "start_date", "end_date",
+                "start_day", "end_day")
+
+# Даты задач в БД дублируются номерами дней от DAY_EPOCH (колонки start_day/end_day)
+DAY_EPOCH = date(2000, 1, 1)
+
+# Те же номера дней, вычисленные в запросе, — для баз без колонок start_day/end_day
+COMPUTED_DAYS = {
+    "start_day": f"CAST(julianday(start_date) - {migrations.DAY_EPOCH_JD} AS INTEGER)",
+    "end_day": f"CAST(julianday(end_date) - {migrations.DAY_EPOCH_JD} AS INTEGER)",
+}
+
+
+def to_day(value: str) -> int:
+    """"yyyy-MM-dd" -> номер дня от DAY_EPOCH."""
+    return (date.fromisoformat(value) - DAY_EPOCH).days
+
+
+# Параметры соединения по умолчанию.
+# WAL позволяет читателям (диаграмма, список) не ждать писателя (редактор),
+# а synchronous=NORMAL в режиме WAL не делает fsync на каждый commit.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 64 * 1024 * 1024,
+    "cache_size": -16000,  # в КиБ (отрицательное значение), ~16 МБ
+    "temp_store": "MEMORY",
+}
+
+# Размер кэша подготовленных выражений (по умолчанию в sqlite3 — 128)
+STATEMENT_CACHE_SIZE = 512
+
+
+def connect(db_file: str, **pragmas):
+    """
+    Открывает соединение и применяет PRAGMA.
+    Любой параметр из DEFAULT_PRAGMAS можно переопределить,
+    например connect(path, synchronous="FULL").
+    """
+    conn = sqlite3.connect(db_file, cached_statements=STATEMENT_CACHE_SIZE)
+    conn.row_factory = sqlite3.Row
+    for name, value in {**DEFAULT_PRAGMAS, **pragmas}.items():
+        if value is not None:
+            conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+def connect_readonly(db_file: str):
+    """
+    Соединение только для чтения: режим журнала и схема файла не меняются,
+    поэтому так можно открывать архивы, в том числе без права записи.
+    """
+    uri = Path(os.path.abspath(db_file)).as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, cached_statements=STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row
     return conn
 
 
+class ConnectionManager:
+    """
+    Выдаёт по одному соединению на поток.
+    sqlite3-соединение нельзя делить между потоками, а WAL даёт
+    параллельное чтение только при отдельных соединениях.
+    """
+
+    def __init__(self, db_file: str, **pragmas):
+        self.db_file = db_file
+        self.pragmas = pragmas
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all = []
+
+    def get(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = connect(self.db_file, **self.pragmas)
+            self._local.conn = conn
+            with self._lock:
+                self._all.append(conn)
+        return conn
+
+    def release(self):
+        """Закрывает соединение текущего потока (вызывается потоком перед завершением)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            self._all = [c for c in self._all if c is not conn]
+        conn.close()
+
+    def close_all(self):
+        with self._lock:
+            conns, self._all = self._all, []
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                # соединение чужого потока — закроется вместе с ним
+                pass
+        self._local = threading.local()
+
+
 def ensure_schema(conn):
-    conn.execute(SCHEMA_SQL)
-    conn.commit()
+    migrations.migrate(conn)
 
 
 def fetch_all_min(conn) -> List[Dict]:
@@ -32,18 +121,126 @@ def fetch_all_min(conn) -> List[Dict]:
     return [dict(row) for row in cur.fetchall()]
 
 
+def fetch_page_min(conn, after_id: int, limit: int) -> List[Dict]:
+    """Страница (id, title) с id > after_id — keyset-пагинация по первичному ключу."""
+    cur = conn.cursor()
+    cur.execute("SELECT id, title FROM tasks WHERE id > ? ORDER BY id ASC LIMIT ?", (after_id, limit))
+    return [dict(row) for row in cur.fetchall()]
+
+
+def fetch_page_before(conn, before_id: int, limit: int) -> List[Dict]:
+    """Страница (id, title) с id < before_id, ближайшие к before_id; по возрастанию id."""
+    cur = conn.cursor()
+    cur.execute("SELECT id, title FROM tasks WHERE id < ? ORDER BY id DESC LIMIT ?", (before_id, limit))
+    return [dict(row) for row in reversed(cur.fetchall())]
+
+
+def _fts_query(text: str) -> str:
+    """Превращает ввод пользователя в запрос FTS5: все слова, каждое — как префикс."""
+    words = [w.replace('"', "") for w in text.split()]
+    return " ".join(f'"{w}"*' for w in words if w)
+
+
+def search_tasks(conn, text: str, limit: int = 200) -> List[Dict]:
+    """
+    Поиск по названию и пунктам SMART. Возвращает (id, title),
+    самые релевантные первыми (совпадение в названии весит больше).
+    """
+    query = _fts_query(text)
+    if not query:
+        return []
+
+    cur = conn.cursor()
+    if has_fts(conn):
+        cur.execute(
+            """SELECT t.id, t.title FROM tasks_fts f JOIN tasks t ON t.id = f.rowid
+               WHERE tasks_fts MATCH ?
+               ORDER BY bm25(tasks_fts, 10.0, 1.0, 1.0, 1.0, 1.0) LIMIT ?""",
+            (query, limit)
+        )
+    else:
+        like = f"%{text.strip()}%"
+        cur.execute(
+            """SELECT id, title FROM tasks
+               WHERE title LIKE ? OR s_text LIKE ? OR m_text LIKE ? OR a_text LIKE ? OR r_text LIKE ?
+               ORDER BY (title LIKE ?) DESC, id ASC LIMIT ?""",
+            (like, like, like, like, like, like, limit)
+        )
+    return [dict(row) for row in cur.fetchall()]
+
+
 def fetch_all_full(conn) -> List[Dict]:
     cur = conn.cursor()
-    cur.execute("SELECT id, title, s_text, m_text, a_text, r_text, start_date, end_date FROM tasks")
+    cur.execute(f"SELECT {', '.join(FULL_COLUMNS)} FROM tasks")
     return [dict(row) for row in cur.fetchall()]
 
 
-def fetch_one(conn, task_id: int) -> Optional[Dict]:
+def fetch_in_range(conn, day_from: Optional[int], day_to: Optional[int],
+                   columns=FULL_COLUMNS) -> List[Dict]:
+    """
+    Задачи, пересекающие интервал [day_from, day_to] (номера дней, см. to_day).
+    None с любой стороны — интервал открыт. Задачи без дат не возвращаются.
+    """
+    bad = set(columns) - set(FULL_COLUMNS)
+    if bad:
+        raise ValueError(f"Неизвестные колонки: {', '.join(sorted(bad))}")
+
+    where = ["start_day IS NOT NULL", "end_day IS NOT NULL"]
+    params = []
+    if day_to is not None:
+        where.append("start_day <= ?")
+        params.append(day_to)
+    if day_from is not None:
+        where.append("end_day >= ?")
+        params.append(day_from)
+
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT {', '.join(columns)} FROM tasks WHERE {' AND '.join(where)}",
+        params
+    )
+    return [dict(row) for row in cur.fetchall()]
+
+
+def fetch_timeline_tasks(conn, limit: int, today: int, columns=FULL_COLUMNS,
+                         computed_days: bool = False) -> List[Dict]:
+    """
+    Задачи для диаграммы: limit текущих задач с ближайшим дедлайном,
+    недостающее добирается самыми недавно завершёнными. today — номер дня.
+    Оба запроса идут по индексу end_day и читают не больше limit строк.
+    computed_days — база без миграции 3 (открыта только для чтения): номера
+    дней считаются в запросе, без индекса.
+    """
+    bad = set(columns) - set(FULL_COLUMNS)
+    if bad:
+        raise ValueError(f"Неизвестные колонки: {', '.join(sorted(bad))}")
+    days = COMPUTED_DAYS if computed_days else {}
+    cols = ", ".join(f"{days[c]} AS {c}" if c in days else c for c in columns)
+    start_day, end_day = days.get("start_day", "start_day"), days.get("end_day", "end_day")
+
     cur = conn.cursor()
     cur.execute(
-        "SELECT id, title, s_text, m_text, a_text, r_text, start_date, end_date FROM tasks WHERE id=?",
-        (task_id,)
+        f"""SELECT {cols} FROM tasks
+            WHERE {end_day} >= ? AND {start_day} IS NOT NULL
+            ORDER BY {end_day} ASC LIMIT ?""",
+        (today, limit)
     )
+    rows = [dict(row) for row in cur.fetchall()]
+
+    if len(rows) < limit:
+        cur.execute(
+            f"""SELECT {cols} FROM tasks
+                WHERE {end_day} < ? AND {start_day} IS NOT NULL
+                ORDER BY {end_day} DESC LIMIT ?""",
+            (today, limit - len(rows))
+        )
+        rows += [dict(row) for row in cur.fetchall()]
+    return rows
+
+
+def fetch_one(conn, task_id: int) -> Optional[Dict]:
+    cur = conn.cursor()
+    cur.execute(f"SELECT {', '.join(FULL_COLUMNS)} FROM tasks WHERE id=?", (task_id,))
     row = cur.fetchone()
     return dict(row) if row else None
 
@@ -88,3 +285,86 @@ def update_task(conn, task_id: int, payload: Dict):
 def delete_task(conn, task_id: int):
     conn.execute("DELETE FROM tasks WHERE id=?", (task_id,))
     conn.commit()
+
+
+# Массовые операции
+# Всё выполняется через executemany в явной транзакции;
+# при chunk_size commit делается после каждой пачки, а не после каждой строки.
+
+BULK_CHUNK_SIZE = 5000
+
+_TASK_FIELDS = ("title", "s_text", "m_text", "a_text", "r_text", "start_date", "end_date")
+
+
+def _task_values(payload: Dict) -> tuple:
+    return tuple(payload.get(f) for f in _TASK_FIELDS)
+
+
+def _chunks(items: List, size: Optional[int]):
+    if not size or size <= 0:
+        size = len(items) or 1
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _run_chunked(conn, items: List, chunk_size: Optional[int], apply_chunk) -> List[int]:
+    """
+    Выполняет apply_chunk для каждой пачки в отдельной транзакции.
+    Незавершённую транзакцию вызывающего не фиксирует (и не откатывает) — это ошибка.
+    """
+    if conn.in_transaction:
+        raise sqlite3.ProgrammingError(
+            "Массовая операция начата внутри незавершённой транзакции: сначала commit() или rollback()")
+    ids = []
+    for chunk in _chunks(items, chunk_size):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            ids.extend(apply_chunk(chunk))
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+    return ids
+
+
+def create_tasks(conn, payloads: List[Dict], chunk_size: Optional[int] = BULK_CHUNK_SIZE) -> List[int]:
+    """Вставляет много задач. Возвращает id новых задач в порядке payloads."""
+    payloads = list(payloads)
+
+    def insert(chunk):
+        conn.executemany(
+            """INSERT INTO tasks(title, s_text, m_text, a_text, r_text, start_date, end_date)
+               VALUES(?,?,?,?,?,?,?)""",
+            [_task_values(p) for p in chunk],
+        )
+        # Внутри одной транзакции AUTOINCREMENT выдаёт id подряд
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return range(last_id - len(chunk) + 1, last_id + 1)
+
+    return _run_chunked(conn, payloads, chunk_size, insert)
+
+
+def update_tasks(conn, payloads: List[Dict], chunk_size: Optional[int] = BULK_CHUNK_SIZE) -> List[int]:
+    """Обновляет задачи (в каждом payload обязателен "id"). Возвращает id обновлённых задач."""
+    payloads = list(payloads)
+
+    def update(chunk):
+        conn.executemany(
+            """UPDATE tasks SET title=?, s_text=?, m_text=?, a_text=?, r_text=?, start_date=?, end_date=?
+               WHERE id=?""",
+            [_task_values(p) + (p["id"],) for p in chunk],
+        )
+        return [p["id"] for p in chunk]
+
+    return _run_chunked(conn, payloads, chunk_size, update)
+
+
+def delete_tasks(conn, task_ids: List[int], chunk_size: Optional[int] = BULK_CHUNK_SIZE) -> List[int]:
+    """Удаляет задачи по списку id. Возвращает id удалённых задач."""
+    task_ids = list(task_ids)
+
+    def delete(chunk):
+        conn.executemany("DELETE FROM tasks WHERE id=?", [(tid,) for tid in chunk])
+        return chunk
+
+    return _run_chunked(conn, task_ids, chunk_size, delete)
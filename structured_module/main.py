@@ -1,9 +1,23 @@
+import os
 import sys
-from PyQt5 import QtWidgets, QtGui
-from gui.main_window import SmartPlannerMainWindow
+from PyQt5 import QtWidgets, QtGui, QtCore
+from gui.main_window import SmartPlannerMainWindow, read_config
+
+
+def configure_opengl():
+    """Атрибуты OpenGL действуют, только если заданы до создания QApplication."""
+    backend = read_config().get("render_backend", "raster")
+    if backend == "raster":
+        return
+    QtCore.QCoreApplication.setAttribute(QtCore.Qt.AA_ShareOpenGLContexts)
+    if backend == "opengl_software":
+        # Windows: встроенный opengl32sw; Linux: Mesa llvmpipe
+        QtCore.QCoreApplication.setAttribute(QtCore.Qt.AA_UseSoftwareOpenGL)
+        os.environ.setdefault("LIBGL_ALWAYS_SOFTWARE", "1")
 
 
 def main():
+    configure_opengl()
     app = QtWidgets.QApplication(sys.argv)
 
     app_font = QtGui.QFont("Arial")
@@ -15,6 +29,7 @@ def main():
 
 if __name__ == "__main__":
     import sys
+    configure_opengl()
     app = QtWidgets.QApplication(sys.argv)
     app.setFont(QtGui.QFont("Arial"))
     w = SmartPlannerMainWindow()
@@ -1,3 +1,108 @@
-def apply_zoom_index(current_index: int, target_index: int) -> int:
-    """Заглушка"""
-    return target_index
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from visualization.timeline_render import ZOOM_STEPS
+
+MIN_ZOOM, MAX_ZOOM = ZOOM_STEPS[0], ZOOM_STEPS[-1]
+# Во сколько раз меняется масштаб за один щелчок колеса
+WHEEL_FACTOR = 1.25
+ANIMATION_MS = 180
+
+
+def clamp_zoom(zoom_days: float) -> float:
+    return min(MAX_ZOOM, max(MIN_ZOOM, zoom_days))
+
+
+def next_zoom_step(zoom_days: float, delta: int) -> float:
+    """Соседний фиксированный шаг из ZOOM_STEPS (кнопки +/-): delta > 0 — отдалить."""
+    if delta > 0:
+        bigger = [s for s in ZOOM_STEPS if s > zoom_days + 1e-6]
+        return bigger[0] if bigger else MAX_ZOOM
+    smaller = [s for s in ZOOM_STEPS if s < zoom_days - 1e-6]
+    return smaller[-1] if smaller else MIN_ZOOM
+
+
+class ZoomAnimator(QtCore.QObject):
+    """
+    Плавный масштаб диаграммы.
+    zoom_days — непрерывный масштаб (дней на деление в единицах ZOOM_STEPS).
+    Сцена разложена для layout_zoom; пока идёт анимация, разница показывается
+    горизонтальным преобразованием view, сцена не перестраивается. Когда
+    анимация закончилась, settled сообщает новый масштаб и день под якорем —
+    владелец перерисовывает сцену и вызывает reset(). Если перерисовка
+    случилась раньше (resize, сохранение задачи), владелец берёт якорь
+    через anchor_day() до перерисовки: reset() остановит анимацию без settled.
+    """
+
+    # масштаб, день под якорем (или nan), x якоря во viewport
+    settled = QtCore.pyqtSignal(float, float, int)
+
+    def __init__(self, view, zoom_days, day_at, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.zoom_days = zoom_days
+        self.layout_zoom = zoom_days
+        self._day_at = day_at  # x сцены -> номер дня (float) или None
+        self._scale = 1.0
+        self._anchor = None    # (x сцены, x во viewport)
+        # Прокрутку под якорем выставляем сами
+        view.setTransformationAnchor(QtWidgets.QGraphicsView.NoAnchor)
+
+        self._anim = QtCore.QPropertyAnimation(self, b"scale", self)
+        self._anim.setDuration(ANIMATION_MS)
+        self._anim.setEasingCurve(QtCore.QEasingCurve.OutCubic)
+        self._anim.finished.connect(self._on_finished)
+
+    def _get_scale(self):
+        return self._scale
+
+    def _set_scale(self, value):
+        self._scale = value
+        self.view.setTransform(QtGui.QTransform.fromScale(value, 1.0))
+        if self._anchor is not None:
+            scene_x, vx = self._anchor
+            self.view.horizontalScrollBar().setValue(int(round(scene_x * value - vx)))
+
+    scale = QtCore.pyqtProperty(float, fget=_get_scale, fset=_set_scale)
+
+    def zoom_to(self, zoom_days, anchor=None):
+        """Анимирует переход к zoom_days; anchor — точка viewport, остающаяся на месте."""
+        zoom_days = clamp_zoom(zoom_days)
+        if abs(zoom_days - self.zoom_days) < 1e-6:
+            return
+        vx = anchor.x() if anchor is not None else self.view.viewport().width() // 2
+        self._anchor = (self.view.mapToScene(QtCore.QPoint(vx, 0)).x(), vx)
+        self.zoom_days = zoom_days
+
+        self._anim.stop()
+        self._anim.setStartValue(self._scale)
+        self._anim.setEndValue(self.layout_zoom / zoom_days)
+        self._anim.start()
+
+    def step(self, delta):
+        self.zoom_to(next_zoom_step(self.zoom_days, delta))
+
+    def wheel(self, factor, pos):
+        self.zoom_to(self.zoom_days * factor, pos)
+
+    def is_animating(self):
+        return self._anim.state() == QtCore.QAbstractAnimation.Running
+
+    def anchor_day(self):
+        """(день под якорем, x якоря во viewport) по текущей раскладке сцены или None."""
+        if self._anchor is None:
+            return None
+        scene_x, vx = self._anchor
+        day = self._day_at(scene_x)
+        return None if day is None else (day, vx)
+
+    def _on_finished(self):
+        day, vx = self.anchor_day() or (float("nan"), 0)
+        self.settled.emit(self.zoom_days, day, vx)
+
+    def reset(self):
+        """Сцена перерисована для zoom_days: убираем преобразование."""
+        self._anim.stop()
+        self._anchor = None
+        self.layout_zoom = self.zoom_days
+        self._scale = 1.0
+        self.view.resetTransform()
@@ -0,0 +1,153 @@
+import math
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from visualization.tile_cache import TILE_SIZE
+
+# Движки, для которых плитки выгодны; в SVG/PDF слой рисуется векторно
+_TILED_ENGINES = (QtGui.QPaintEngine.Raster, QtGui.QPaintEngine.OpenGL2)
+
+
+class AxisItem(QtWidgets.QGraphicsItem):
+    """
+    Ось времени, сетка, деления, подписи дат и линия "Сегодня" одним элементом.
+    paint() рисует только деления из exposedRect, подписи — готовые QStaticText
+    (их не больше ~366 разных: "dd.MM"), перья и шрифт берутся из общего TimelineStyle.
+
+    С tile_cache (TileCache) слой рисуется плитками TILE_SIZE, закэшированными
+    по параметрам оси (шаг, масштаб, тема, диапазон): прокрутка только копирует
+    готовые плитки. Пока view масштабирован (анимация zoom), слой рисуется напрямую.
+    """
+
+    def __init__(self, date_of, tile_cache=None, parent=None):
+        super().__init__(parent)
+        self._date_of = date_of
+        self.tile_cache = tile_cache
+        self._rect = QtCore.QRectF()
+        self._labels = {}
+        self._params = None
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.setAcceptedMouseButtons(QtCore.Qt.NoButton)
+        # фон под барами задач
+        self.setZValue(-1)
+
+    def set_params(self, axis_start, axis_end, step_days, px_per_day, axis_start_x, axis_y,
+                   today, style):
+        ui_scale = style.ui_scale
+        params = (axis_start, axis_end, step_days, px_per_day, axis_start_x, axis_y,
+                  today, style.key)
+        if params == self._params:
+            return
+
+        if self._params is None or self._params[-1][1] != ui_scale:
+            self._labels.clear()
+        self._params = params
+
+        self.axis_start, self.axis_end, self.step_days = axis_start, axis_end, step_days
+        self.step_px = step_days * px_per_day
+        self.axis_start_x, self.axis_y, self.ui_scale = axis_start_x, axis_y, ui_scale
+        self.count = (axis_end - axis_start) // step_days
+        self.axis_end_x = axis_start_x + (axis_end - axis_start) * px_per_day
+
+        self.style = style
+        self.font = style.axis_font
+        self.metrics = style.axis_metrics
+
+        # Линия "Сегодня" — только если сегодня попадает на деление
+        self.today_x = None
+        if axis_start <= today <= axis_end and (today - axis_start) % step_days == 0:
+            self.today_x = axis_start_x + (today - axis_start) * px_per_day
+
+        self.label_w = self.metrics.horizontalAdvance("00.00")
+        bottom = axis_y + max(25 * ui_scale, 8 * ui_scale + 4 + self.metrics.height())
+        self.prepareGeometryChange()
+        self._rect = QtCore.QRectF(axis_start_x - self.label_w, 0,
+                                   self.axis_end_x - axis_start_x + 2 * self.label_w, bottom + 2)
+        self.update()
+
+    def boundingRect(self):
+        return self._rect
+
+    def tick_range(self, left, right):
+        """Номера делений, попадающих в [left, right] с учётом ширины подписи."""
+        half = self.label_w / 2
+        first = max(0, int((left - half - self.axis_start_x) // self.step_px))
+        last = min(self.count, int((right + half - self.axis_start_x) // self.step_px) + 1)
+        return first, last
+
+    def _label(self, day):
+        text = self._date_of(day).toString("dd.MM")
+        static = self._labels.get(text)
+        if static is None:
+            static = QtGui.QStaticText(text)
+            static.prepare(QtGui.QTransform(), self.font)
+            self._labels[text] = static
+        return static
+
+    def paint(self, painter, option, widget=None):
+        if self._params is None:
+            return
+        if self.tile_cache is not None and self._can_tile(painter):
+            self._paint_tiles(painter, option.exposedRect)
+        else:
+            self._paint_layer(painter, option.exposedRect)
+
+    def _can_tile(self, painter):
+        engine = painter.paintEngine()
+        if engine is None or engine.type() not in _TILED_ENGINES:
+            return False
+        # только сдвиг на целое число пикселей, иначе плитки размоются
+        t = painter.worldTransform()
+        return (t.type() <= QtGui.QTransform.TxTranslate
+                and t.dx() == int(t.dx()) and t.dy() == int(t.dy()))
+
+    def _paint_tiles(self, painter, exposed):
+        dpr = painter.device().devicePixelRatioF()
+        hints = int(painter.renderHints())
+        rect = exposed.intersected(self._rect)
+        if rect.isEmpty():
+            return
+        for ty in range(math.floor(rect.top() / TILE_SIZE), math.ceil(rect.bottom() / TILE_SIZE)):
+            for tx in range(math.floor(rect.left() / TILE_SIZE), math.ceil(rect.right() / TILE_SIZE)):
+                tile = QtCore.QRectF(tx * TILE_SIZE, ty * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+
+                def render(p, tile=tile):
+                    p.setRenderHints(QtGui.QPainter.RenderHints(hints))
+                    p.translate(-tile.left(), -tile.top())
+                    p.setClipRect(tile)
+                    self._paint_layer(p, tile)
+
+                pixmap = self.tile_cache.get((self._params, tx, ty, dpr, hints), render, dpr)
+                painter.drawPixmap(tile.topLeft(), pixmap)
+
+    def _paint_layer(self, painter, exposed):
+        ui = self.ui_scale
+        axis_y = self.axis_y
+
+        # Линия оси
+        left = max(exposed.left(), self.axis_start_x)
+        right = min(exposed.right(), self.axis_end_x)
+        if left <= right:
+            painter.setPen(self.style.axis_pen)
+            painter.drawLine(QtCore.QLineF(left, axis_y, right, axis_y))
+
+        first, last = self.tick_range(exposed.left(), exposed.right())
+        xs = [self.axis_start_x + k * self.step_px for k in range(first, last + 1)]
+
+        # Вертикальная сетка и деления
+        painter.setPen(self.style.grid_pen)
+        painter.drawLines([QtCore.QLineF(x, 0, x, axis_y) for x in xs])
+        painter.setPen(self.style.tick_pen)
+        painter.drawLines([QtCore.QLineF(x, axis_y - 5 * ui, x, axis_y + 5 * ui) for x in xs])
+
+        # Подписи дат по центру делений
+        painter.setFont(self.font)
+        painter.setPen(self.style.text_pen)
+        label_y = axis_y + 8 * ui + 4
+        for k, x in zip(range(first, last + 1), xs):
+            static = self._label(self.axis_start + k * self.step_days)
+            painter.drawStaticText(QtCore.QPointF(x - static.size().width() / 2, label_y), static)
+
+        if self.today_x is not None and exposed.left() <= self.today_x <= exposed.right():
+            painter.setPen(self.style.today_pen)
+            painter.drawLine(QtCore.QLineF(self.today_x, 0, self.today_x, axis_y + 25 * ui))
@@ -0,0 +1,72 @@
+from itertools import accumulate
+
+from PyQt5 import QtCore, QtWidgets
+
+
+def bucket_counts(intervals, first_day, days_per_bucket, buckets):
+    """
+    Сколько задач активно в каждом интервале-корзине оси.
+    intervals — (начальный день, конечный день) включительно.
+    Разностный массив + префиксная сумма: O(задач + корзин), без цикла по дням.
+    """
+    diff = [0] * (buckets + 1)
+    for sd, ed in intervals:
+        a = max(0, int((sd - first_day) // days_per_bucket))
+        b = min(buckets - 1, int((ed - first_day) // days_per_bucket))
+        if a <= b:
+            diff[a] += 1
+            diff[b + 1] -= 1
+    return list(accumulate(diff[:buckets]))
+
+
+class DensityItem(QtWidgets.QGraphicsItem):
+    """
+    Полоса плотности задач для сильно отдалённого масштаба:
+    вместо баров — гистограмма числа активных задач по корзинам в несколько пикселей.
+    Стоимость отрисовки зависит от ширины экрана (exposedRect), а не от числа задач.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rect = QtCore.QRectF()
+        self.counts = []
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.setAcceptedMouseButtons(QtCore.Qt.NoButton)
+
+    def set_data(self, intervals, axis_start, axis_end, px_per_day, axis_start_x, y, height,
+                 style):
+        self.bucket_px = max(1.0, 4 * style.ui_scale)
+        days_per_bucket = self.bucket_px / px_per_day
+        buckets = max(1, int((axis_end - axis_start) * px_per_day / self.bucket_px) + 1)
+
+        self.counts = bucket_counts(intervals, axis_start, days_per_bucket, buckets)
+        self._max = max(self.counts) or 1
+        self.x0, self.y, self.height = axis_start_x, y, height
+
+        self._brushes = style.density_brushes
+
+        self.prepareGeometryChange()
+        self._rect = QtCore.QRectF(self.x0, y, buckets * self.bucket_px, height)
+        self.update()
+
+    def boundingRect(self):
+        return self._rect
+
+    def paint(self, painter, option, widget=None):
+        if not self.counts:
+            return
+        exposed = option.exposedRect
+        first = max(0, int((exposed.left() - self.x0) // self.bucket_px))
+        last = min(len(self.counts) - 1, int((exposed.right() - self.x0) // self.bucket_px))
+        bottom = self.y + self.height
+
+        painter.setPen(QtCore.Qt.NoPen)
+        for i in range(first, last + 1):
+            count = self.counts[i]
+            if not count:
+                continue
+            share = count / self._max
+            h = max(2.0, share * self.height)
+            levels = len(self._brushes)
+            painter.setBrush(self._brushes[min(levels - 1, int(share * levels))])
+            painter.drawRect(QtCore.QRectF(self.x0 + i * self.bucket_px, bottom - h, self.bucket_px, h))
@@ -0,0 +1,28 @@
+import heapq
+
+
+def pack_lanes(intervals):
+    """
+    Раскладывает интервалы по дорожкам так, чтобы в одной дорожке они не пересекались.
+    intervals — список (начало, конец), конец не включается.
+    Жадный алгоритм: интервалы по возрастанию начала, каждый занимает дорожку,
+    освободившуюся раньше всех (куча концов дорожек), иначе открывает новую.
+    O(n log n). Возвращает (номер дорожки для каждого интервала, число дорожек).
+    """
+    order = sorted(range(len(intervals)), key=lambda i: intervals[i][0])
+    lanes = [0] * len(intervals)
+    heap = []  # (конец последнего интервала в дорожке, номер дорожки)
+    count = 0
+
+    for i in order:
+        start, end = intervals[i]
+        if heap and heap[0][0] <= start:
+            lane = heap[0][1]
+            heapq.heapreplace(heap, (end, lane))
+        else:
+            lane = count
+            count += 1
+            heapq.heappush(heap, (end, lane))
+        lanes[i] = lane
+
+    return lanes, count
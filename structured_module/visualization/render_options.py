@@ -0,0 +1,73 @@
+from PyQt5 import QtGui, QtWidgets
+
+# Способ отрисовки диаграммы: ключ -> подпись в настройках
+RENDER_BACKENDS = {
+    "raster": "Растровый (CPU)",
+    "opengl": "OpenGL",
+    "opengl_software": "OpenGL, программный (Mesa)",
+}
+
+# Режим обновления QGraphicsView: ключ -> (режим, подпись)
+UPDATE_MODES = {
+    "minimal": (QtWidgets.QGraphicsView.MinimalViewportUpdate, "Минимальные области"),
+    "smart": (QtWidgets.QGraphicsView.SmartViewportUpdate, "Умный"),
+    "bounding": (QtWidgets.QGraphicsView.BoundingRectViewportUpdate, "Общий прямоугольник"),
+    "full": (QtWidgets.QGraphicsView.FullViewportUpdate, "Весь viewport"),
+}
+
+DEFAULT_RENDER_OPTIONS = {
+    "render_backend": "raster",
+    "viewport_update": "minimal",
+    "cache_background": False,
+    "item_cache": False,
+    "antialiasing": True,
+}
+
+
+def render_options(cfg):
+    """Параметры отрисовки из конфига; неизвестные значения заменяются значениями по умолчанию."""
+    options = {key: cfg.get(key, value) for key, value in DEFAULT_RENDER_OPTIONS.items()}
+    if options["render_backend"] not in RENDER_BACKENDS:
+        options["render_backend"] = DEFAULT_RENDER_OPTIONS["render_backend"]
+    if options["viewport_update"] not in UPDATE_MODES:
+        options["viewport_update"] = DEFAULT_RENDER_OPTIONS["viewport_update"]
+    return options
+
+
+def opengl_available() -> bool:
+    context = QtGui.QOpenGLContext()
+    return context.create()
+
+
+def apply_view_options(view, options) -> bool:
+    """
+    Настраивает QGraphicsView: viewport (обычный или QOpenGLWidget),
+    кэш фона, режим обновления, сглаживание.
+    Возвращает False, если OpenGL запрошен, но недоступен (остаётся растровый viewport).
+    """
+    ok = True
+    want_gl = options["render_backend"] != "raster"
+    if want_gl and not opengl_available():
+        want_gl, ok = False, False
+    has_gl = isinstance(view.viewport(), QtWidgets.QOpenGLWidget)
+    if want_gl != has_gl:
+        if want_gl:
+            gl = QtWidgets.QOpenGLWidget()
+            fmt = QtGui.QSurfaceFormat()
+            fmt.setSamples(4 if options["antialiasing"] else 0)
+            gl.setFormat(fmt)
+            view.setViewport(gl)
+        else:
+            view.setViewport(QtWidgets.QWidget())
+
+    view.setCacheMode(QtWidgets.QGraphicsView.CacheBackground if options["cache_background"]
+                      else QtWidgets.QGraphicsView.CacheNone)
+    view.setViewportUpdateMode(UPDATE_MODES[options["viewport_update"]][0])
+    view.setRenderHint(QtGui.QPainter.Antialiasing, options["antialiasing"])
+    view.setRenderHint(QtGui.QPainter.TextAntialiasing, options["antialiasing"])
+    return ok
+
+
+def item_cache_mode(options):
+    return (QtWidgets.QGraphicsItem.DeviceCoordinateCache if options["item_cache"]
+            else QtWidgets.QGraphicsItem.NoCache)
@@ -0,0 +1,142 @@
+import json
+import platform
+import time
+
+from PyQt5 import QtCore
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "items", "_t0")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.items = None
+
+    def __enter__(self):
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter_ns() - self._t0, self.items)
+        return False
+
+
+class _NullPhase:
+    """Фаза выключенного профилировщика: ничего не замеряет."""
+    items = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class RenderProfiler:
+    """
+    Замеры фаз перерисовки диаграммы (perf_counter_ns) и числа элементов.
+
+    Кадр начинается в begin() (draw_diagram), фазы добавляются через
+    phase()/record(), rendered() отмечает, что сцена обновлена, и кадр
+    закрывается первой после этого отрисовкой view (painted()). Отрисовки
+    до rendered() (пока задачи читаются в фоне) к кадру не относятся.
+    Закрытые кадры дописываются строкой JSON в log_path, последний
+    доступен в last (его показывает оверлей TimelineView).
+    Выключенный профилировщик почти ничего не стоит: phase() отдаёт заглушку.
+    """
+
+    def __init__(self, log_path=None):
+        self.enabled = False
+        self.log_path = log_path
+        self.last = None
+        self._frame = None
+        self._rendered = False
+        self._t0 = 0
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+        self._frame = None
+        self._rendered = False
+        if not enabled:
+            self.last = None
+
+    def begin(self, **meta):
+        if not self.enabled:
+            return
+        if self._frame is not None and self._rendered:
+            # прошлый кадр так и не был отрисован (например, диаграмма скрыта)
+            self._finish()
+        # кадр без rendered() вытеснен новой перерисовкой и не записывается
+        self._rendered = False
+        self._t0 = time.perf_counter_ns()
+        self._frame = {"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), **meta, "phases": []}
+
+    def phase(self, name):
+        """with profiler.phase("layout") as ph: ...; ph.items = n"""
+        if self._frame is None:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def record(self, name, ns, items=None):
+        """Добавляет время фазы; повтор той же фазы подряд суммируется."""
+        if self._frame is None:
+            return
+        phases = self._frame["phases"]
+        if phases and phases[-1]["name"] == name:
+            phases[-1]["ns"] += ns
+            if items is not None:
+                phases[-1]["items"] = items
+        else:
+            phases.append({"name": name, "ns": ns, "items": items})
+
+    def since_begin(self, name, items=None):
+        """Фаза от begin() до текущего момента (например, чтение задач в фоне)."""
+        if self._frame is not None:
+            self.record(name, time.perf_counter_ns() - self._t0, items)
+
+    def rendered(self) -> bool:
+        """Сцена кадра готова. True, если кадр открыт — view нужно перерисовать."""
+        if self._frame is None:
+            return False
+        self._rendered = True
+        return True
+
+    def painted(self, ns) -> bool:
+        """Отрисовка view заняла ns. True, если этим закрыт кадр."""
+        if self._frame is None or not self._rendered:
+            return False
+        self.record("paint", ns)
+        self._finish()
+        return True
+
+    def _finish(self):
+        frame, self._frame = self._frame, None
+        frame["total_ns"] = time.perf_counter_ns() - self._t0
+        frame["python"] = platform.python_version()
+        frame["qt"] = QtCore.QT_VERSION_STR
+        self.last = frame
+        if self.log_path:
+            try:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(frame, ensure_ascii=False) + "\n")
+            except OSError:
+                # журнал — вспомогательный, перерисовку из-за него не ломаем
+                pass
+
+    def summary_lines(self):
+        """Строки оверлея для последнего кадра."""
+        if self.last is None:
+            return []
+        lines = []
+        for p in self.last["phases"]:
+            items = f"  ({p['items']})" if p["items"] is not None else ""
+            lines.append(f"{p['name']:<8}{p['ns'] / 1e6:8.2f} мс{items}")
+        lines.append(f"{'всего':<8}{self.last['total_ns'] / 1e6:8.2f} мс")
+        return lines
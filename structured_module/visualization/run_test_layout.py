@@ -0,0 +1,55 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visualization.density_item import bucket_counts
+from visualization.lane_layout import pack_lanes
+
+
+_results = []
+
+
+def check(title, actual, expected):
+    status = "Pass" if actual == expected else "Fail"
+    _results.append(status)
+    print(f"  {title}")
+    print(f"  Ожидалось: {expected!r}, получено: {actual!r} -> {status}")
+
+
+def case_pack_lanes():
+    print("Тест-кейс 1: Раскладка баров по дорожкам (pack_lanes)")
+    check("стык (конец не включается) — одна дорожка",
+          pack_lanes([(0, 5), (5, 10), (10, 12)]), ([0, 0, 0], 1))
+    check("полное перекрытие n интервалов — n дорожек",
+          pack_lanes([(3, 9)] * 4), ([0, 1, 2, 3], 4))
+    check("освободившаяся дорожка занимается снова, порядок входа не важен",
+          pack_lanes([(6, 8), (0, 4), (1, 7)]), ([0, 0, 1], 2))
+    check("пустой список", pack_lanes([]), ([], 0))
+
+
+def case_bucket_counts():
+    print("Тест-кейс 2: Число активных задач по корзинам полосы плотности (bucket_counts)")
+    # ось — дни 10..19, корзины по 2 дня; интервалы включают оба конца
+    check("интервал до оси не учитывается", bucket_counts([(0, 5)], 10, 2, 5), [0, 0, 0, 0, 0])
+    check("интервал после оси не учитывается", bucket_counts([(25, 30)], 10, 2, 5), [0, 0, 0, 0, 0])
+    check("интервалы на краях обрезаются по оси",
+          bucket_counts([(8, 11), (18, 30), (0, 100)], 10, 2, 5), [2, 1, 1, 1, 2])
+    check("интервал внутри оси — только свои корзины",
+          bucket_counts([(12, 15)], 10, 2, 5), [0, 1, 1, 0, 0])
+    check("дробный размер корзины", bucket_counts([(10, 10), (11, 11)], 10, 0.5, 4), [1, 0, 1, 0])
+
+
+def run_tests():
+    print("=== ЗАПУСК ТЕСТИРОВАНИЯ РАСКЛАДКИ ДИАГРАММЫ ===\n")
+    for case in (case_pack_lanes, case_bucket_counts):
+        case()
+        print()
+
+    passed = _results.count("Pass")
+    print(f"=== ИТОГ: Пройдено {passed} из {len(_results)} проверок ===")
+    return passed == len(_results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_tests() else 1)
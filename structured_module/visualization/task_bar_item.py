@@ -0,0 +1,24 @@
+from PyQt5 import QtWidgets
+
+
+class TaskBarItem(QtWidgets.QGraphicsRectItem):
+    """
+    Бар задачи. Подсказка строится не при раскладке, а при первом наведении:
+    set_task() только запоминает задачу (объект с методом tooltip()).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.task = None
+        self.setAcceptHoverEvents(True)
+
+    def set_task(self, task):
+        if task is not self.task:
+            self.task = task
+            self.setToolTip("")
+
+    def hoverEnterEvent(self, event):
+        # QGraphicsScene показывает toolTip() после наведения — к этому моменту он готов
+        if self.task is not None and not self.toolTip():
+            self.setToolTip(self.task.tooltip())
+        super().hoverEnterEvent(event)
@@ -0,0 +1,57 @@
+from collections import OrderedDict
+
+from PyQt5 import QtCore, QtGui
+
+# Сторона плитки в логических пикселях
+TILE_SIZE = 256
+
+
+class TileCache:
+    """
+    LRU-кэш плиток QPixmap с бюджетом памяти.
+    Ключ плитки выбирает владелец (параметры слоя + номер плитки);
+    когда суммарный размер превышает budget_bytes, вытесняются
+    давно не использованные плитки.
+    """
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self.bytes = 0
+        self._tiles = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def get(self, key, render, dpr=1.0):
+        """Плитка по ключу; при промахе рисуется через render(painter)."""
+        pixmap = self._tiles.get(key)
+        if pixmap is not None:
+            self._tiles.move_to_end(key)
+            self.hits += 1
+            return pixmap
+
+        self.misses += 1
+        side = int(TILE_SIZE * dpr + 0.5)
+        pixmap = QtGui.QPixmap(side, side)
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(pixmap)
+        render(painter)
+        painter.end()
+
+        self._tiles[key] = pixmap
+        self.bytes += self._size(pixmap)
+        while self.bytes > self.budget_bytes and len(self._tiles) > 1:
+            _, old = self._tiles.popitem(last=False)
+            self.bytes -= self._size(old)
+        return pixmap
+
+    def clear(self):
+        self._tiles.clear()
+        self.bytes = 0
+
+    @staticmethod
+    def _size(pixmap):
+        return pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
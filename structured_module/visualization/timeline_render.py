@@ -1,17 +1,50 @@
-from PyQt5 import QtCore, QtGui, QtWidgets
-import operator
+from PyQt5 import QtCore, QtWidgets
+
+from visualization.axis_item import AxisItem
+from visualization.density_item import DensityItem
+from visualization.lane_layout import pack_lanes
+from visualization.render_profiler import RenderProfiler
+from visualization.task_bar_item import TaskBarItem
+from visualization.tile_cache import TileCache
+from visualization.timeline_style import style_for
+
+# Сколько задач показывает диаграмма по умолчанию
+DEFAULT_MAX_TASKS = 5
+
+# Допустимые шаги оси, дней на деление
+ZOOM_STEPS = (1, 7, 14, 30)
+
+# Если на задачу приходится меньше стольких пикселей оси,
+# вместо баров рисуется полоса плотности (DensityItem)
+DENSITY_PX_PER_TASK = 4
+
+# Бюджет памяти плиток фона (ось, сетка, подписи)
+BACKGROUND_CACHE_BYTES = 32 * 1024 * 1024
+
+# Даты на диаграмме — номера дней от EPOCH (как колонки start_day/end_day в БД)
+EPOCH = QtCore.QDate(2000, 1, 1)
 
 
 # Вспомогательные функции
-def align_to_step(qdate: QtCore.QDate, step_days: int, ceil=False):
+def day_of(qdate: QtCore.QDate) -> int:
+    return EPOCH.daysTo(qdate)
+
+
+def date_of(day: int) -> QtCore.QDate:
+    return EPOCH.addDays(day)
+
+
+def today_day() -> int:
+    return day_of(QtCore.QDate.currentDate())
+
+
+def align_to_step(day: int, step_days: int, ceil=False):
     """
-    Выравнивает дату по шагу step_days начиная с "эпохи" 2000-01-01.
+    Выравнивает номер дня по шагу step_days начиная с "эпохи" 2000-01-01.
     Если ceil=True, округляет вверх, иначе вниз.
     """
-    epoch = QtCore.QDate(2000, 1, 1)
-    days = epoch.daysTo(qdate)
-    k = (days + (step_days - 1)) // step_days if ceil else days // step_days
-    return epoch.addDays(k * step_days)
+    k = (day + (step_days - 1)) // step_days if ceil else day // step_days
+    return k * step_days
 
 
 def ensure_min_span(start_d, end_d, step_days, px_per_day,
@@ -25,155 +58,342 @@ def ensure_min_span(start_d, end_d, step_days, px_per_day,
     span_days_min_div = min_divisions * step_days
     needed_px = max(0, viewport_width - (left_pad + right_pad))
     span_days_min_view = int((needed_px / max(px_per_day, 0.001)) + 0.999)
-    base = start_d.daysTo(end_d)
+    base = end_d - start_d
     span = max(base, span_days_min_div, span_days_min_view)
     axis_start = start_d
-    axis_end = align_to_step(axis_start.addDays(span), step_days, ceil=True)
+    axis_end = align_to_step(axis_start + span, step_days, ceil=True)
     return axis_start, axis_end
 
 
-# Основная функция
-def draw_timeline(scene, tasks, step_days, viewport_w, ui_scale=1.0, dark_theme=True):
+def pixels_per_day(step_days, ui_scale=1.0):
+    return 3.6 * (30 / step_days) * ui_scale
+
+
+def tick_step(zoom_days):
+    """
+    Шаг делений из ZOOM_STEPS для непрерывного масштаба zoom_days:
+    наименьший, при котором деления не ближе ~60 пикселей (при ui_scale 1).
+    """
+    for step in ZOOM_STEPS:
+        if step >= 0.55 * zoom_days:
+            return step
+    return ZOOM_STEPS[-1]
+
+
+class TimelineTask:
     """
-    Рисует таймлайн задач в QGraphicsScene.
+    Задача в том виде, в каком её рисует диаграмма: дни, подпись и
+    подсказка, которая форматируется только при первом обращении.
     """
-    parsed = []
-    today = QtCore.QDate.currentDate()
-
-    # Цвета и стили
-    if dark_theme:
-        rect_brush_color = QtGui.QColor(70, 130, 180)
-        rect_pen_color = QtGui.QColor("#89b4fa")
-        text_color_main = QtGui.QColor("#cdd6f4")
-        axis_color = QtGui.QColor("#585b70")
-        tick_color = QtGui.QColor("#89b4fa")
-        tick_text_color = QtGui.QColor("#bac2de")
-        grid_color = QtGui.QColor(128, 128, 128, 40)
-    else:
-        rect_brush_color = QtGui.QColor(135, 206, 250)
-        rect_pen_color = QtGui.QColor("#3399ff")
-        text_color_main = QtGui.QColor("#1e1e2e")
-        axis_color = QtGui.QColor("#a0a0a0")
-        tick_color = QtGui.QColor("#3399ff")
-        tick_text_color = QtGui.QColor("#2a2a2a")
-        grid_color = QtGui.QColor(150, 150, 150, 60)
-
-    # Фильтрация задач
-    valid_tasks = []
-    for t in tasks:
-        s, e = t.get("start_date"), t.get("end_date")
-        if not s or not e:
-            continue
-        sd, ed = QtCore.QDate.fromString(s, "yyyy-MM-dd"), QtCore.QDate.fromString(e, "yyyy-MM-dd")
-        if not (sd.isValid() and ed.isValid()):
-            continue
-        t["_sd"], t["_ed"] = sd, ed
-        valid_tasks.append(t)
-
-    if not valid_tasks:
-        msg = "Нет задач с корректными датами"
-        txt = scene.addText(msg)
-        txt.setDefaultTextColor(text_color_main)
-        font = QtGui.QFont()
-        font.setPointSize(int(16 * ui_scale))
-        txt.setFont(font)
-        scene.setSceneRect(0, 0, viewport_w, 300 * ui_scale)
+
+    __slots__ = ("id", "title", "sd", "ed", "_row", "_tip")
+
+    def __init__(self, row):
+        self.id = row["id"]
+        self.title = row.get("title") or f"Задача {row['id']}"
+        self.sd, self.ed = row["start_day"], row["end_day"]
+        self._row = row
+        self._tip = None
+
+    def tooltip(self):
+        if self._tip is None:
+            t = self._row
+            self._tip = (f"{t.get('title')}\n"
+                         f"S: {t.get('s_text') or '-'}\n"
+                         f"M: {t.get('m_text') or '-'}\n"
+                         f"A: {t.get('a_text') or '-'}\n"
+                         f"R: {t.get('r_text') or '-'}\n"
+                         f"{date_of(self.sd).toString('dd.MM.yyyy')} → "
+                         f"{date_of(self.ed).toString('dd.MM.yyyy')}")
+        return self._tip
+
+
+def _row_key(row):
+    """Ключ версии строки, если версии не переданы: содержимое строки."""
+    return tuple(row.get(k) for k in ("title", "s_text", "m_text", "a_text", "r_text",
+                                      "start_day", "end_day"))
+
+
+class TimelineRenderer:
+    """
+    Рисует таймлайн задач в QGraphicsScene и хранит созданные элементы
+    между перерисовками: бары по id задачи и один AxisItem для оси и сетки.
+    Повторный render() двигает, перекрашивает, добавляет или удаляет
+    только то, что изменилось, вместо scene.clear() и полной пересборки.
+
+    Если задана видимая область (set_visible_range), элементы создаются
+    только для неё и запаса по краям; остальное достраивается при прокрутке.
+    Без неё рисуется вся диаграмма (например, для экспорта).
+
+    Разобранные задачи (TimelineTask) хранятся по (id, версия строки), так что
+    перерисовки из-за масштаба, темы или ui_scale не разбирают строки заново.
+    """
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.visible = None   # (x0, x1) видимой части сцены или None
+        self._layout = None
+        self.bars = {}        # id задачи -> (прямоугольник, подпись)
+        self._bar_state = {}  # id задачи -> (геометрия, стиль), с которыми нарисован бар
+        self.axis = None      # AxisItem: ось, сетка, подписи, линия "Сегодня"
+        self.density = None   # DensityItem в режиме плотности
+        self._axis_origin = None  # (axis_start, axis_start_x, px_per_day) последней раскладки
+        self._tasks = {}      # id задачи -> (версия строки, TimelineTask)
+        self.profiler = RenderProfiler()  # выключен; владелец может подставить свой
+        self.cache_mode = QtWidgets.QGraphicsItem.NoCache  # кэш баров и подписей
+        self.tiles = TileCache(BACKGROUND_CACHE_BYTES)    # плитки AxisItem
+        self.message = None
+
+    def set_visible_range(self, x0, x1):
+        """Сообщает видимую часть сцены по горизонтали и достраивает/убирает элементы."""
+        self.visible = (x0, x1)
+        if self._layout is not None:
+            self._materialize()
+
+    def day_at(self, x):
+        """Номер дня (дробный) под x сцены в текущей раскладке или None."""
+        if self._axis_origin is None:
+            return None
+        axis_start, axis_start_x, px_per_day = self._axis_origin
+        return axis_start + (x - axis_start_x) / px_per_day
+
+    def x_at(self, day):
+        """x сцены для номера дня в текущей раскладке или None."""
+        if self._axis_origin is None:
+            return None
+        axis_start, axis_start_x, px_per_day = self._axis_origin
+        return axis_start_x + (day - axis_start) * px_per_day
+
+    def item_of(self, task_id):
+        """Бар задачи, если он сейчас есть на сцене (с учётом виртуализации), иначе None."""
+        items = self.bars.get(task_id)
+        return items[0] if items is not None else None
+
+    def set_cache_mode(self, mode):
+        """Режим кэширования (QGraphicsItem.CacheMode) для баров и их подписей."""
+        self.cache_mode = mode
+        for items in self.bars.values():
+            for item in items:
+                item.setCacheMode(mode)
+
+    def clear(self):
+        self._layout = None
+        self._axis_origin = None
+        for tid in list(self.bars):
+            self._remove_bar(tid)
+        self.axis = self._remove_item(self.axis)
+        self.density = self._remove_item(self.density)
+        self.message = self._remove_item(self.message)
+
+    def render(self, tasks, step_days, viewport_w, ui_scale=1.0, dark_theme=True, px_per_day=None,
+               row_version=None):
+        """
+        tasks уже отобраны (см. task_manager.fetch_timeline_tasks).
+        step_days — шаг делений оси; px_per_day задаёт масштаб отдельно от шага
+        (непрерывный zoom), по умолчанию pixels_per_day(step_days).
+        row_version(id) — версия строки задачи (TaskCache.row_version); без неё
+        изменившаяся задача узнаётся по содержимому строки.
+        Непересекающиеся задачи делят одну дорожку (см. lane_layout.pack_lanes).
+        При сильном отдалении (меньше DENSITY_PX_PER_TASK пикселей оси на задачу)
+        бары заменяются полосой плотности.
+        """
+        today = today_day()
+        style = style_for(dark_theme, ui_scale)
+        prof = self.profiler
+
+        # Задачи без корректных дат пропускаем (start_day/end_day у них NULL)
+        with prof.phase("filter") as ph:
+            valid_tasks = [t for t in tasks
+                           if t.get("start_day") is not None and t.get("end_day") is not None]
+            ph.items = len(valid_tasks)
+
+        if not valid_tasks:
+            self.clear()
+            self._show_message(style, viewport_w)
+            return
+        self.message = self._remove_item(self.message)
+
+        # Настройки размеров
+        if px_per_day is None:
+            px_per_day = pixels_per_day(step_days, ui_scale)
+        left_pad, right_pad = 40 * ui_scale, 40 * ui_scale
+        y_start, bar_h, spacing = 20 * ui_scale, 35 * ui_scale, 60 * ui_scale
+
+        min_date = min(t["start_day"] for t in valid_tasks)
+        max_date = max(t["end_day"] for t in valid_tasks) + 1
+
+        axis_start = align_to_step(min_date, step_days)
+        axis_end_raw = align_to_step(max_date, step_days, ceil=True)
+        axis_start, axis_end = ensure_min_span(axis_start, axis_end_raw, step_days, px_per_day,
+                                               min_divisions=10, viewport_width=viewport_w,
+                                               left_pad=left_pad, right_pad=right_pad)
+
+        total_days = axis_end - axis_start
+        axis_start_x = left_pad
+        axis_end_x = left_pad + total_days * px_per_day
+        self._axis_origin = (axis_start, axis_start_x, px_per_day)
+
+        if (axis_end_x - axis_start_x) / len(valid_tasks) < DENSITY_PX_PER_TASK:
+            # 1. РЕЖИМ ПЛОТНОСТИ: бары убираем, рисуем гистограмму
+            self._layout = dict(bars=[], style=style)
+            self._materialize()
+            with prof.phase("density") as ph:
+                if self.density is None:
+                    self.density = DensityItem()
+                    self.scene.addItem(self.density)
+                strip_h = 3 * spacing
+                self.density.set_data([(t["start_day"], t["end_day"]) for t in valid_tasks],
+                                      axis_start, axis_end, px_per_day, axis_start_x, y_start, strip_h,
+                                      style)
+                ph.items = len(self.density.counts)
+            current_y = y_start + strip_h
+        else:
+            self.density = self._remove_item(self.density)
+            with prof.phase("parse") as ph:
+                parsed = self._parse(valid_tasks, row_version)
+                ph.items = len(parsed)
+            current_y = self._layout_bars(parsed, axis_start, axis_start_x, px_per_day,
+                                          y_start, bar_h, spacing, style)
+
+        # 2. ОСЬ ВРЕМЕНИ, СЕТКА И ЛИНИЯ "СЕГОДНЯ" — один элемент
+        with prof.phase("axis") as ph:
+            axis_y = current_y + 15 * ui_scale
+            if self.axis is None:
+                self.axis = AxisItem(date_of, self.tiles)
+                self.scene.addItem(self.axis)
+            self.axis.set_params(axis_start, axis_end, step_days, px_per_day, axis_start_x, axis_y,
+                                 today, style)
+            ph.items = self.axis.count + 1
+
+            # Установка границ сцены
+            self.scene.setSceneRect(0, 0, max(axis_end_x + right_pad, viewport_w),
+                                    axis_y + 60 * ui_scale)
+
+    def _parse(self, rows, row_version):
+        """TimelineTask для строк: прежние объекты, если версия строки не изменилась."""
+        cache, parsed = {}, []
+        for row in rows:
+            tid = row["id"]
+            version = row_version(tid) if row_version is not None else _row_key(row)
+            cached = self._tasks.get(tid)
+            task = cached[1] if cached is not None and cached[0] == version else TimelineTask(row)
+            cache[tid] = (version, task)
+            parsed.append(task)
+        self._tasks = cache
+        return parsed
+
+    def _layout_bars(self, parsed, axis_start, axis_start_x, px_per_day,
+                     y_start, bar_h, spacing, style):
+        """Раскладывает бары по дорожкам; возвращает y под последней дорожкой."""
+        # Раскладка — только числа; элементы создаёт _materialize.
+        # Дорожку занимает бар или его подпись, если она длиннее бара
+        ui_scale = style.ui_scale
+        gap = 10 * ui_scale
+
+        with self.profiler.phase("layout") as ph:
+            spans, widths = [], []
+            for task in parsed:
+                x = axis_start_x + (task.sd - axis_start) * px_per_day
+                w = max(15 * ui_scale, (task.ed + 1 - task.sd) * px_per_day)
+                occupied = max(w, 8 * ui_scale + style.title_advance(task.title) + 8)
+                spans.append((x, x + occupied + gap))
+                widths.append(w)
+            lanes, lane_count = pack_lanes(spans)
+
+            bars = []
+            for task, (x, _), w, lane in zip(parsed, spans, widths, lanes):
+                bars.append((task.id, (x, y_start + lane * spacing, w, bar_h, task)))
+            ph.items = lane_count
+
+        self._layout = dict(bars=bars, style=style)
+        self._materialize()
+        return y_start + lane_count * spacing
+
+    def _materialize(self):
+        """Создаёт элементы для видимой области (с запасом) и убирает остальные."""
+        lay = self._layout
+        style = lay["style"]
+        ui_scale = style.ui_scale
+
+        if self.visible is None:
+            lo, hi = float("-inf"), float("inf")
+        else:
+            x0, x1 = self.visible
+            margin = max(x1 - x0, 200 * ui_scale)
+            lo, hi = x0 - margin, x1 + margin
+
+        # Бары
+        with self.profiler.phase("items") as ph:
+            seen = set()
+            for tid, geometry in lay["bars"]:
+                x, w = geometry[0], geometry[2]
+                if x + w >= lo and x <= hi:
+                    self._place_bar(tid, geometry, style)
+                    seen.add(tid)
+            for tid in [tid for tid in self.bars if tid not in seen]:
+                self._remove_bar(tid)
+            ph.items = len(self.bars)
+
+    # --- Бары ---
+    def _place_bar(self, tid, geometry, style):
+        state = (geometry, style.key)
+        old = self._bar_state.get(tid)
+        if old == state:
+            return
+
+        x, y, w, h, task = geometry
+        items = self.bars.get(tid)
+        if items is None:
+            rect = TaskBarItem()
+            self.scene.addItem(rect)
+            rect.setFlag(QtWidgets.QGraphicsItem.ItemIsSelectable, True)
+            rect.setData(0, tid)
+            txt = self.scene.addText("")
+            rect.setCacheMode(self.cache_mode)
+            txt.setCacheMode(self.cache_mode)
+            items = self.bars[tid] = (rect, txt)
+        rect, txt = items
+
+        if old is None or old[1] != style.key:
+            rect.setPen(style.bar_pen)
+            rect.setBrush(style.bar_brush)
+            txt.setFont(style.title_font)
+            txt.setDefaultTextColor(style.colors["text_main"])
+
+        rect.setRect(QtCore.QRectF(x, y, w, h))
+        rect.set_task(task)
+        if txt.toPlainText() != task.title:
+            txt.setPlainText(task.title)
+        txt.setPos(x + 8 * style.ui_scale, y + (h - style.title_height) / 2)
+        self._bar_state[tid] = state
+
+    def _remove_bar(self, tid):
+        for item in self.bars.pop(tid):
+            self.scene.removeItem(item)
+        self._bar_state.pop(tid, None)
+
+    # --- Прочее ---
+    def _show_message(self, style, viewport_w):
+        ui_scale = style.ui_scale
+        if self.message is None:
+            self.message = self.scene.addText("Нет задач с корректными датами")
+        txt = self.message
+        txt.setDefaultTextColor(style.colors["text_main"])
+        txt.setFont(style.message_font)
+        self.scene.setSceneRect(0, 0, viewport_w, 300 * ui_scale)
         txt.setPos((viewport_w - txt.boundingRect().width()) / 2, 100 * ui_scale)
-        return
-
-    # Сортировка (показываем топ-5 актуальных)
-    ongoing_tasks = [t for t in valid_tasks if t["_ed"] >= today]
-    past_tasks = [t for t in valid_tasks if t["_ed"] < today]
-    ongoing_tasks.sort(key=operator.itemgetter("_ed"))
-    past_tasks.sort(key=operator.itemgetter("_ed"), reverse=True)
-    selected_tasks = ongoing_tasks[:5]
-    if len(selected_tasks) < 5:
-        selected_tasks += past_tasks[:5 - len(selected_tasks)]
-    selected_tasks = list(reversed(selected_tasks))
-
-    for t in selected_tasks:
-        sd, ed = t["_sd"], t["_ed"]
-        tip = (f"{t.get('title')}\n"
-               f"S: {t.get('s_text') or '-'}\n"
-               f"M: {t.get('m_text') or '-'}\n"
-               f"A: {t.get('a_text') or '-'}\n"
-               f"R: {t.get('r_text') or '-'}\n"
-               f"{sd.toString('dd.MM.yyyy')} → {ed.toString('dd.MM.yyyy')}")
-        parsed.append((t["id"], t.get("title") or f"Задача {t['id']}", sd, ed, tip))
-
-    # Настройки размеров
-    px_per_day = 3.6 * (30 / step_days) * ui_scale
-    left_pad, right_pad = 40 * ui_scale, 40 * ui_scale
-    y_start, bar_h, spacing = 20 * ui_scale, 35 * ui_scale, 60 * ui_scale
-    current_y = y_start
-
-    min_date = min(p[2] for p in parsed)
-    max_date = max(p[3] for p in parsed).addDays(1)
-
-    axis_start = align_to_step(min_date, step_days)
-    axis_end_raw = align_to_step(max_date, step_days, ceil=True)
-    axis_start, axis_end = ensure_min_span(axis_start, axis_end_raw, step_days, px_per_day,
-                                           min_divisions=10, viewport_width=viewport_w,
-                                           left_pad=left_pad, right_pad=right_pad)
-
-    total_days = axis_start.daysTo(axis_end)
-    axis_start_x = left_pad
-    axis_end_x = left_pad + total_days * px_per_day
-
-    # 1. РИСУЕМ БАРЫ ЗАДАЧ
-    for tid, title, sd, ed, tip in parsed:
-        x = axis_start_x + axis_start.daysTo(sd) * px_per_day
-        w = max(15 * ui_scale, sd.daysTo(ed.addDays(1)) * px_per_day)
-
-        rect = scene.addRect(QtCore.QRectF(x, current_y, w, bar_h),
-                             QtGui.QPen(rect_pen_color, 2),
-                             QtGui.QBrush(rect_brush_color))
-        rect.setFlag(QtWidgets.QGraphicsItem.ItemIsSelectable, True)
-        rect.setData(0, tid)
-        rect.setToolTip(tip)
-
-        txt = scene.addText(title)
-        f = txt.font()
-        f.setPointSize(int(9 * ui_scale))
-        f.setBold(True)
-        txt.setFont(f)
-        txt.setDefaultTextColor(text_color_main)
-        txt.setPos(x + 8 * ui_scale, current_y + (bar_h - txt.boundingRect().height()) / 2)
-
-        current_y += spacing
-
-    # 2. ОСЬ ВРЕМЕНИ И СЕТКА
-    axis_y = current_y + 15 * ui_scale
-    grid_pen = QtGui.QPen(grid_color, 1, QtCore.Qt.DotLine)
-    scene.addLine(axis_start_x, axis_y, axis_end_x, axis_y, QtGui.QPen(axis_color, 2))
-
-    tick_font = QtGui.QFont("Arial", int(10 * ui_scale))
-    fm = QtGui.QFontMetrics(tick_font)
-
-    cur = axis_start
-    while cur <= axis_end:
-        x = axis_start_x + axis_start.daysTo(cur) * px_per_day
-
-        # Вертикальная сетка
-        scene.addLine(x, 0, x, axis_y, grid_pen)
-
-        # Деление на оси
-        scene.addLine(x, axis_y - 5 * ui_scale, x, axis_y + 5 * ui_scale, QtGui.QPen(tick_color))
-
-        # Текст даты
-        date_str = cur.toString("dd.MM")
-        label = scene.addText(date_str)
-        label.setFont(tick_font)
-        label.setDefaultTextColor(tick_text_color)
-        tw = fm.horizontalAdvance(date_str)
-        label.setPos(x - tw / 2, axis_y + 8 * ui_scale)
-
-        # Линия "Сегодня"
-        if cur == today:
-            today_pen = QtGui.QPen(QtGui.QColor("#ff5555"), 2)
-            scene.addLine(x, 0, x, axis_y + 25 * ui_scale, today_pen)
-
-        cur = cur.addDays(step_days)
-
-    # Установка границ сцены
-    scene.setSceneRect(0, 0, max(axis_end_x + right_pad, viewport_w), axis_y + 60 * ui_scale)
\ No newline at end of file
+
+    def _remove_item(self, item):
+        if item is not None:
+            self.scene.removeItem(item)
+        return None
+
+
+def draw_timeline(scene, tasks, step_days, viewport_w, ui_scale=1.0, dark_theme=True):
+    """
+    Рисует таймлайн задач в пустой QGraphicsScene.
+    Для повторных перерисовок одной сцены используйте TimelineRenderer.
+    """
+    renderer = TimelineRenderer(scene)
+    renderer.render(tasks, step_days, viewport_w, ui_scale=ui_scale, dark_theme=dark_theme)
+    return renderer
@@ -0,0 +1,101 @@
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+# Цвета диаграммы по темам (dark_theme -> имя -> цвет)
+PALETTES = {
+    True: dict(
+        rect_brush=(70, 130, 180),
+        rect_pen="#89b4fa",
+        text_main="#cdd6f4",
+        axis="#585b70",
+        tick="#89b4fa",
+        tick_text="#bac2de",
+        grid=(128, 128, 128, 40),
+        today="#ff5555",
+        background="#1f1f36",
+    ),
+    False: dict(
+        rect_brush=(135, 206, 250),
+        rect_pen="#3399ff",
+        text_main="#1e1e2e",
+        axis="#a0a0a0",
+        tick="#3399ff",
+        tick_text="#2a2a2a",
+        grid=(150, 150, 150, 60),
+        today="#ff5555",
+        background="#ffffff",
+    ),
+}
+
+# Число уровней прозрачности полосы плотности
+DENSITY_LEVELS = 16
+
+
+def _color(spec):
+    return QtGui.QColor(spec) if isinstance(spec, str) else QtGui.QColor(*spec)
+
+
+class TimelineStyle:
+    """
+    Готовые цвета, перья, кисти, шрифты и метрики таймлайна для одной пары
+    (тема, ui_scale). Создаётся один раз на пару (см. style_for), элементы
+    сцены получают общие объекты и не собирают их при каждой перерисовке.
+    """
+
+    def __init__(self, dark_theme, ui_scale):
+        self.key = (dark_theme, ui_scale)
+        self.ui_scale = ui_scale
+        self.colors = {name: _color(spec) for name, spec in PALETTES[dark_theme].items()}
+        c = self.colors
+
+        # Бары
+        self.bar_pen = QtGui.QPen(c["rect_pen"], 2)
+        self.bar_brush = QtGui.QBrush(c["rect_brush"])
+        self.title_font = QtGui.QFont()
+        self.title_font.setPointSize(int(9 * ui_scale))
+        self.title_font.setBold(True)
+        self.title_metrics = QtGui.QFontMetricsF(self.title_font)
+        self._title_advances = {}
+        # Высота QGraphicsTextItem с этим шрифтом — чтобы центрировать
+        # подпись без boundingRect() на каждом баре
+        probe = QtWidgets.QGraphicsTextItem("0")
+        probe.setFont(self.title_font)
+        self.title_height = probe.boundingRect().height()
+
+        # Ось, сетка, подписи дат
+        self.axis_font = QtGui.QFont("Arial", int(10 * ui_scale))
+        self.axis_metrics = QtGui.QFontMetricsF(self.axis_font)
+        self.axis_pen = QtGui.QPen(c["axis"], 2)
+        self.grid_pen = QtGui.QPen(c["grid"], 1, QtCore.Qt.DotLine)
+        self.tick_pen = QtGui.QPen(c["tick"])
+        self.text_pen = QtGui.QPen(c["tick_text"])
+        self.today_pen = QtGui.QPen(c["today"], 2)
+
+        # Полоса плотности: кисть на каждый уровень заполнения
+        self.density_brushes = []
+        for level in range(1, DENSITY_LEVELS + 1):
+            color = QtGui.QColor(c["rect_brush"])
+            color.setAlpha(60 + level * 195 // DENSITY_LEVELS)
+            self.density_brushes.append(QtGui.QBrush(color))
+
+        # Сообщение "Нет задач"
+        self.message_font = QtGui.QFont()
+        self.message_font.setPointSize(int(16 * ui_scale))
+
+    def title_advance(self, title):
+        """Ширина подписи бара; измеряется один раз на текст."""
+        advance = self._title_advances.get(title)
+        if advance is None:
+            advance = self._title_advances[title] = self.title_metrics.horizontalAdvance(title)
+        return advance
+
+
+_styles = {}
+
+
+def style_for(dark_theme, ui_scale):
+    """Общий TimelineStyle для темы и масштаба интерфейса."""
+    key = (bool(dark_theme), ui_scale)
+    style = _styles.get(key)
+    if style is None:
+        style = _styles[key] = TimelineStyle(*key)
+    return style
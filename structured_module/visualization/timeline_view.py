@@ -0,0 +1,68 @@
+import time
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class TimelineView(QtWidgets.QGraphicsView):
+    """
+    QGraphicsView диаграммы: Ctrl+колесо просит изменить масштаб под курсором.
+    resized — изменилась ширина (диаграмму нужно подогнать под неё).
+    Если задан включённый RenderProfiler, время отрисовки попадает в его кадр,
+    а сводка последнего кадра рисуется оверлеем в углу.
+    """
+
+    # множитель масштаба (дней на деление), точка viewport под курсором
+    zoomRequested = QtCore.pyqtSignal(float, QtCore.QPoint)
+    resized = QtCore.pyqtSignal()
+
+    def __init__(self, scene, wheel_factor, parent=None):
+        super().__init__(scene, parent)
+        self.wheel_factor = wheel_factor
+        self.profiler = None
+
+    def wheelEvent(self, event):
+        if event.modifiers() & QtCore.Qt.ControlModifier:
+            steps = event.angleDelta().y() / 120
+            if steps:
+                # колесо от себя — приблизить, то есть меньше дней на деление
+                self.zoomRequested.emit(self.wheel_factor ** -steps, event.pos())
+            event.accept()
+            return
+        super().wheelEvent(event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if event.size().width() != event.oldSize().width():
+            self.resized.emit()
+
+    def paintEvent(self, event):
+        prof = self.profiler
+        if prof is None or not prof.enabled:
+            super().paintEvent(event)
+            return
+        t0 = time.perf_counter_ns()
+        super().paintEvent(event)
+        if prof.painted(time.perf_counter_ns() - t0):
+            # кадр закрыт — перерисовываем, чтобы оверлей показал его цифры
+            self.viewport().update()
+
+    def drawForeground(self, painter, rect):
+        super().drawForeground(painter, rect)
+        prof = self.profiler
+        if prof is None or not prof.enabled:
+            return
+        lines = prof.summary_lines() or ["профилирование: ждём кадр"]
+
+        painter.save()
+        painter.resetTransform()
+        font = QtGui.QFont("Monospace")
+        font.setStyleHint(QtGui.QFont.TypeWriter)
+        painter.setFont(font)
+        fm = painter.fontMetrics()
+        w = max(fm.horizontalAdvance(line) for line in lines) + 16
+        h = fm.height() * len(lines) + 12
+        painter.fillRect(QtCore.QRect(8, 8, w, h), QtGui.QColor(0, 0, 0, 170))
+        painter.setPen(QtGui.QColor("#e0e0e0"))
+        for i, line in enumerate(lines):
+            painter.drawText(16, 14 + fm.ascent() + i * fm.height(), line)
+        painter.restore()